@@ -3,25 +3,36 @@ API routes for alert operations.
 Endpoints: /alerts, /alerts/active, /alerts/{id}
 """
 from fastapi import APIRouter, HTTPException, Body
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse
+from typing import List, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field
 
 from utils import log
 from core import alerts_engine
 
-router = APIRouter(prefix="/alerts", tags=["alerts"])
+router = APIRouter(
+    prefix="/alerts",
+    tags=["alerts"],
+    default_response_class=ORJSONResponse,
+)
+
+VALID_METRICS = frozenset({"zscore", "spread", "correlation", "price"})
+
+AlertOperator = Literal[">", "<", ">=", "<=", "=="]
 
 
 class AlertCreate(BaseModel):
     """Request model for creating an alert."""
     metric: str = Field(..., description="Metric to monitor (zscore, spread, correlation, price)")
     pair: str = Field(..., description="Trading pair or single symbol")
-    op: str = Field(..., alias="op", description="Comparison operator (>, <, >=, <=, ==)")
+    op: AlertOperator = Field(..., alias="op", description="Comparison operator (>, <, >=, <=, ==)")
     value: float = Field(..., description="Threshold value")
 
 
 class AlertResponse(BaseModel):
     """Response model for alert."""
+    model_config = ConfigDict(frozen=True, extra="ignore", from_attributes=True)
+    
     id: str
     metric: str
     pair: str
@@ -45,20 +56,11 @@ async def create_alert(alert: AlertCreate = Body(...)):
         Created alert with ID
     """
     try:
-        # Validate metric
-        valid_metrics = ["zscore", "spread", "correlation", "price"]
-        if alert.metric.lower() not in valid_metrics:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid metric. Must be one of: {valid_metrics}"
-            )
-        
-        # Validate operator
-        valid_operators = [">", "<", ">=", "<=", "=="]
-        if alert.op not in valid_operators:
+        # Validate metric (operator is validated by AlertCreate)
+        if alert.metric.lower() not in VALID_METRICS:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid operator. Must be one of: {valid_operators}"
+                detail=f"Invalid metric. Must be one of: {sorted(VALID_METRICS)}"
             )
         
         # Create alert
@@ -71,17 +73,7 @@ async def create_alert(alert: AlertCreate = Body(...)):
         
         log.info(f"Created alert: {created_alert.id}")
         
-        return AlertResponse(
-            id=created_alert.id,
-            metric=created_alert.metric,
-            pair=created_alert.pair,
-            operator=created_alert.operator,
-            value=created_alert.value,
-            active=created_alert.active,
-            created_at=created_alert.created_at,
-            triggered_at=created_alert.triggered_at,
-            trigger_count=created_alert.trigger_count
-        )
+        return AlertResponse.model_validate(created_alert)
     
     except HTTPException:
         raise
@@ -101,20 +93,9 @@ async def get_alerts():
     try:
         alerts = alerts_engine.get_all_alerts()
         
-        return [
-            AlertResponse(
-                id=a.id,
-                metric=a.metric,
-                pair=a.pair,
-                operator=a.operator,
-                value=a.value,
-                active=a.active,
-                created_at=a.created_at,
-                triggered_at=a.triggered_at,
-                trigger_count=a.trigger_count
-            )
-            for a in alerts
-        ]
+        # Alert dataclasses already match AlertResponse; orjson serializes
+        # them natively, so skip per-row Pydantic validation
+        return ORJSONResponse(alerts)
     
     except Exception as e:
         log.error(f"Error getting alerts: {e}")
@@ -135,19 +116,7 @@ async def get_triggered_alerts(limit: Optional[int] = None):
     try:
         notifications = alerts_engine.get_triggered_alerts(limit)
         
-        return [
-            {
-                "id": n.id,
-                "alert_id": n.alert_id,
-                "message": n.message,
-                "metric": n.metric,
-                "pair": n.pair,
-                "actual_value": n.actual_value,
-                "threshold_value": n.threshold_value,
-                "ts": n.ts
-            }
-            for n in notifications
-        ]
+        return ORJSONResponse(notifications)
     
     except Exception as e:
         log.error(f"Error getting triggered alerts: {e}")
@@ -171,17 +140,7 @@ async def get_alert(alert_id: str):
         if not alert:
             raise HTTPException(status_code=404, detail=f"Alert {alert_id} not found")
         
-        return AlertResponse(
-            id=alert.id,
-            metric=alert.metric,
-            pair=alert.pair,
-            operator=alert.operator,
-            value=alert.value,
-            active=alert.active,
-            created_at=alert.created_at,
-            triggered_at=alert.triggered_at,
-            trigger_count=alert.trigger_count
-        )
+        return AlertResponse.model_validate(alert)
     
     except HTTPException:
         raise
@@ -1,15 +1,92 @@
 """
 API routes for analytics operations.
-Endpoints: /analytics/pair, /analytics/adf
+Endpoints: /analytics/pair, /analytics/batch, /analytics/adf
 """
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
+import asyncio
+from functools import lru_cache
+from fastapi import APIRouter, HTTPException, Query, Body
+from pydantic import BaseModel, Field
+from typing import List, Optional, Tuple
 
 from utils import log, settings
 from core import analytics_engine, data_manager
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
+MAX_BATCH_ITEMS = 100
+
+VALID_METHODS = frozenset({"OLS", "HUBER", "THEIL-SEN", "KALMAN"})
+
+# Reuse a resampled price frame for this long across analytics requests
+PAIR_FRAME_TTL = 1.0
+
+
+class PairAnalyticsSpec(BaseModel):
+    """Analytics parameters for a single pair in a batch request."""
+    pair: str = Field(..., description="Pair in format SYMBOL_A-SYMBOL_B")
+    tf: str = Field(default="1m", description="Timeframe (1s, 1m, 5m)")
+    window: int = Field(default=60, description="Rolling window size")
+    regression: str = Field(default="OLS", description="Regression method")
+
+
+class BatchRequest(BaseModel):
+    """Request model for batch pair analytics."""
+    items: List[PairAnalyticsSpec] = Field(
+        ...,
+        max_length=MAX_BATCH_ITEMS,
+        description="Pairs to compute analytics for"
+    )
+
+
+@lru_cache(maxsize=1024)
+def _split_pair(pair: str) -> Tuple[str, str]:
+    """Split a SYMBOL_A-SYMBOL_B pair, raising HTTPException on bad format."""
+    symbol_a, _, symbol_b = pair.partition("-")
+    if not symbol_a or not symbol_b or "-" in symbol_b:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid pair format: {pair}. Expected SYMBOL_A-SYMBOL_B"
+        )
+    return symbol_a, symbol_b
+
+
+async def _refresh_pair_frames(symbol_a: str, symbol_b: str, tf: str):
+    """
+    Make sure both symbols have an OHLCV frame at most PAIR_FRAME_TTL old.
+    
+    Analytics are then computed from the cached frames, so bursts of
+    requests for the same pair resample each symbol once instead of once
+    per metric.
+    """
+    for symbol in (symbol_a, symbol_b):
+        await asyncio.to_thread(data_manager.refresh_ohlcv, symbol, tf, PAIR_FRAME_TTL)
+
+
+def _validate_analytics_params(pair: str, tf: str, window: int, regression: str):
+    """Validate pair analytics parameters, raising HTTPException on error."""
+    _split_pair(pair)
+    
+    # Validate timeframe
+    if tf not in settings.resample_intervals_set:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Timeframe {tf} not supported. Available: {settings.resample_intervals_list}"
+        )
+    
+    # Validate regression method
+    if regression.upper() not in VALID_METHODS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Regression method {regression} not supported. Available: {sorted(VALID_METHODS)}"
+        )
+    
+    # Validate window
+    if window < 2:
+        raise HTTPException(
+            status_code=400,
+            detail="Window size must be at least 2"
+        )
+
 
 @router.get("/pair")
 async def get_pair_analytics(
@@ -36,34 +113,17 @@ async def get_pair_analytics(
         - adf: {pvalue, stat}
     """
     try:
-        # Validate timeframe
-        if tf not in settings.resample_intervals_list:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Timeframe {tf} not supported. Available: {settings.resample_intervals_list}"
-            )
-        
-        # Validate regression method
-        valid_methods = ["OLS", "HUBER", "THEIL-SEN", "KALMAN"]
-        if regression.upper() not in valid_methods:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Regression method {regression} not supported. Available: {valid_methods}"
-            )
-        
-        # Validate window
-        if window < 2:
-            raise HTTPException(
-                status_code=400,
-                detail="Window size must be at least 2"
-            )
+        _validate_analytics_params(pair, tf, window, regression)
+        await _refresh_pair_frames(*_split_pair(pair), tf)
         
         # Compute analytics
-        analytics = analytics_engine.compute_pair_analytics(
+        analytics = await asyncio.to_thread(
+            analytics_engine.compute_pair_analytics,
             pair=pair,
             timeframe=tf,
             window=window,
-            regression=regression
+            regression=regression,
+            force_resample=False
         )
         
         if not analytics:
@@ -89,6 +149,68 @@ async def get_pair_analytics(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/batch")
+async def get_batch_analytics(request: BatchRequest = Body(...)):
+    """
+    Compute analytics for multiple pairs in a single request.
+    
+    Each symbol's price series is resampled once and shared across all
+    pairs that reference it. Invalid or failing items are reported in
+    ``errors`` without failing the whole batch.
+    
+    Args:
+        request: Batch of pair analytics specs (max 100 items)
+        
+    Returns:
+        Dictionary containing:
+        - results: List of {index, pair, analytics}
+        - errors: List of {index, pair, detail}
+    """
+    try:
+        valid_items = []
+        errors = []
+        
+        for index, item in enumerate(request.items):
+            try:
+                _validate_analytics_params(item.pair, item.tf, item.window, item.regression)
+            except HTTPException as e:
+                errors.append({"index": index, "pair": item.pair, "detail": e.detail})
+                continue
+            
+            valid_items.append((index, {
+                "pair": item.pair.upper(),
+                "timeframe": item.tf,
+                "window": item.window,
+                "regression": item.regression,
+            }))
+        
+        batch_analytics = await asyncio.to_thread(
+            analytics_engine.compute_batch_analytics,
+            [spec for _, spec in valid_items]
+        )
+        
+        results = []
+        for (index, spec), analytics in zip(valid_items, batch_analytics):
+            if not analytics:
+                errors.append({
+                    "index": index,
+                    "pair": spec["pair"],
+                    "detail": f"No data available for pair {spec['pair']}"
+                })
+            elif "error" in analytics:
+                errors.append({"index": index, "pair": spec["pair"], "detail": analytics["error"]})
+            else:
+                results.append({"index": index, "pair": spec["pair"], "analytics": analytics})
+        
+        log.debug(f"Computed batch analytics: {len(results)} ok, {len(errors)} failed")
+        
+        return {"results": results, "errors": errors}
+    
+    except Exception as e:
+        log.error(f"Error computing batch analytics: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/adf")
 async def get_adf_test(
     pair: str = Query(..., description="Pair in format SYMBOL_A-SYMBOL_B"),
@@ -112,13 +234,18 @@ async def get_adf_test(
         - is_stationary: Boolean (pvalue < 0.05)
     """
     try:
+        symbol_a, symbol_b = _split_pair(pair)
+        await _refresh_pair_frames(symbol_a, symbol_b, tf)
+        
         # Compute ADF test
-        adf_result = analytics_engine.compute_adf_test(
-            symbol_a=pair.split("-")[0],
-            symbol_b=pair.split("-")[1],
+        adf_result = await asyncio.to_thread(
+            analytics_engine.compute_adf_test,
+            symbol_a=symbol_a,
+            symbol_b=symbol_b,
             timeframe=tf,
             window=window,
-            method=regression
+            method=regression,
+            force_resample=False
         )
         
         # Add interpretation
@@ -132,6 +259,8 @@ async def get_adf_test(
         
         return adf_result
     
+    except HTTPException:
+        raise
     except Exception as e:
         log.error(f"Error in ADF test: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -152,12 +281,16 @@ async def get_hedge_ratio(
         List of {ts, value} dictionaries
     """
     try:
-        hedge_ratio = analytics_engine.compute_hedge_ratio(
+        await _refresh_pair_frames(symbol_a, symbol_b, tf)
+        
+        hedge_ratio = await asyncio.to_thread(
+            analytics_engine.compute_hedge_ratio,
             symbol_a=symbol_a,
             symbol_b=symbol_b,
             timeframe=tf,
             window=window,
-            method=method
+            method=method,
+            force_resample=False
         )
         
         return {"hedge_ratio": hedge_ratio}
@@ -182,12 +315,16 @@ async def get_spread(
         List of {ts, value} dictionaries
     """
     try:
-        spread = analytics_engine.compute_spread(
+        await _refresh_pair_frames(symbol_a, symbol_b, tf)
+        
+        spread = await asyncio.to_thread(
+            analytics_engine.compute_spread,
             symbol_a=symbol_a,
             symbol_b=symbol_b,
             timeframe=tf,
             window=window,
-            method=method
+            method=method,
+            force_resample=False
         )
         
         return {"spread": spread}
@@ -212,12 +349,16 @@ async def get_zscore(
         List of {ts, value} dictionaries
     """
     try:
-        zscore = analytics_engine.compute_zscore(
+        await _refresh_pair_frames(symbol_a, symbol_b, tf)
+        
+        zscore = await asyncio.to_thread(
+            analytics_engine.compute_zscore,
             symbol_a=symbol_a,
             symbol_b=symbol_b,
             timeframe=tf,
             window=window,
-            method=method
+            method=method,
+            force_resample=False
         )
         
         return {"zscore": zscore}
@@ -241,11 +382,15 @@ async def get_correlation(
         List of {ts, value} dictionaries
     """
     try:
-        correlation = analytics_engine.compute_rolling_correlation(
+        await _refresh_pair_frames(symbol_a, symbol_b, tf)
+        
+        correlation = await asyncio.to_thread(
+            analytics_engine.compute_rolling_correlation,
             symbol_a=symbol_a,
             symbol_b=symbol_b,
             timeframe=tf,
-            window=window
+            window=window,
+            force_resample=False
         )
         
         return {"correlation": correlation}
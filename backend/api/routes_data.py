@@ -2,17 +2,22 @@
 API routes for data operations.
 Endpoints: /symbols, /data/{symbol}
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, Response
 from typing import Optional, List
 from datetime import datetime
 
-from utils import log, settings, normalize_symbol
+from utils import log, settings, normalize_symbol, cached, make_etag, etag_matches
 from core import data_manager
 
 router = APIRouter(prefix="", tags=["data"])
 
+# Polling clients may reuse a response for a second; revalidate via ETag after
+CACHE_CONTROL = "private, max-age=1"
+
 
 @router.get("/symbols")
+@cached(ttl=300)
 async def get_symbols() -> List[str]:
     """
     Get list of available trading symbols.
@@ -29,6 +34,7 @@ async def get_symbols() -> List[str]:
 
 @router.get("/data/{symbol}")
 async def get_data(
+    request: Request,
     symbol: str,
     tf: str = Query(default="1m", description="Timeframe (1s, 1m, 5m)"),
     from_ts: Optional[str] = Query(default=None, alias="from", description="Start timestamp (ISO)"),
@@ -52,14 +58,14 @@ async def get_data(
         symbol = normalize_symbol(symbol)
         
         # Validate symbol
-        if symbol not in settings.symbols_list:
+        if symbol not in settings.symbols_set:
             raise HTTPException(
                 status_code=400,
                 detail=f"Symbol {symbol} not supported. Available: {settings.symbols_list}"
             )
         
         # Validate timeframe
-        if tf not in settings.resample_intervals_list:
+        if tf not in settings.resample_intervals_set:
             raise HTTPException(
                 status_code=400,
                 detail=f"Timeframe {tf} not supported. Available: {settings.resample_intervals_list}"
@@ -74,9 +80,18 @@ async def get_data(
             to_ts=to_ts
         )
         
+        # The last candle keeps its ts while it fills, so include its volume
+        last = data[-1] if data else {}
+        etag = make_etag(symbol, tf, last.get("ts"), last.get("volume"), len(data))
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        
         log.debug(f"Returning {len(data)} candles for {symbol} @ {tf}")
         
-        return data
+        # Candles are plain str/float dicts; serialize directly with orjson
+        return ORJSONResponse(data, headers=headers)
     
     except HTTPException:
         raise
@@ -87,6 +102,7 @@ async def get_data(
 
 @router.get("/data/{symbol}/ticks")
 async def get_ticks(
+    request: Request,
     symbol: str,
     limit: Optional[int] = Query(default=1000, description="Maximum number of ticks"),
     from_ts: Optional[str] = Query(default=None, alias="from", description="Start timestamp (ISO)"),
@@ -107,7 +123,7 @@ async def get_ticks(
     try:
         symbol = normalize_symbol(symbol)
         
-        if symbol not in settings.symbols_list:
+        if symbol not in settings.symbols_set:
             raise HTTPException(
                 status_code=400,
                 detail=f"Symbol {symbol} not supported"
@@ -120,9 +136,15 @@ async def get_ticks(
             to_ts=to_ts
         )
         
+        etag = make_etag(symbol, ticks[-1]["ts"] if ticks else None, len(ticks))
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        
         log.debug(f"Returning {len(ticks)} ticks for {symbol}")
         
-        return ticks
+        return ORJSONResponse(ticks, headers=headers)
     
     except HTTPException:
         raise
@@ -132,6 +154,7 @@ async def get_ticks(
 
 
 @router.get("/data/stats")
+@cached(ttl=5)
 async def get_stats(symbol: Optional[str] = None):
     """
     Get buffer statistics.
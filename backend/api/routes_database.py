@@ -8,10 +8,14 @@ Provides endpoints for:
 - Database statistics and management
 """
 
+import asyncio
 from datetime import datetime, timedelta
-from typing import Optional
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import FileResponse
+from typing import Any, Dict, Iterator, Literal, Optional
+import ciso8601
+import orjson
+import pandas as pd
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
 
 from core.db import (
@@ -19,13 +23,26 @@ from core.db import (
     get_ticks,
     get_resampled_data,
     delete_old_data,
-    export_to_csv,
     get_database_stats,
 )
-from utils import log
+from utils import log, cached, make_etag, etag_matches
 
 router = APIRouter(prefix="/database", tags=["Database"])
 
+CSV_CHUNK_ROWS = 10_000
+NDJSON_CHUNK_ROWS = 1_000
+
+# Polling clients may reuse a response for a second; revalidate via ETag after
+CACHE_CONTROL = "private, max-age=1"
+
+# Backpressure for /ticks: concurrent queries beyond this get a 429, and
+# each response is capped at MAX_TICK_CELLS (rows x columns)
+MAX_CONCURRENT_TICK_QUERIES = 4
+MAX_TICK_CELLS = 1_000_000
+TICK_COLUMNS = 4  # timestamp, symbol, price, volume
+
+_tick_query_gate = asyncio.Semaphore(MAX_CONCURRENT_TICK_QUERIES)
+
 
 class TicksQueryRequest(BaseModel):
     """Request model for querying tick data."""
@@ -54,7 +71,60 @@ class ExportRequest(BaseModel):
     end_time: Optional[str] = Field(None, description="End time (ISO format)")
 
 
+def _iter_csv(df: pd.DataFrame, chunk_rows: int = CSV_CHUNK_ROWS) -> Iterator[str]:
+    """Yield a DataFrame as CSV text in chunks of ``chunk_rows`` rows."""
+    yield df.iloc[:0].to_csv(index=False)
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows].to_csv(index=False, header=False)
+
+
+def _iter_ndjson(df: pd.DataFrame, chunk_rows: int = NDJSON_CHUNK_ROWS) -> Iterator[str]:
+    """Yield a DataFrame as newline-delimited JSON in chunks of ``chunk_rows`` rows."""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows].to_json(
+            orient="records",
+            lines=True,
+            date_format="iso",
+            date_unit="ms",
+            double_precision=15,
+        )
+
+
+def _records_response(envelope: Dict[str, Any], df: pd.DataFrame) -> Response:
+    """
+    Build a JSON response with ``df`` embedded as ``data`` records.
+    
+    Serializes the DataFrame directly with ``to_json`` instead of
+    materializing one Python dict per row.
+    """
+    data = df.to_json(
+        orient="records",
+        date_format="iso",
+        date_unit="ms",
+        double_precision=15,
+    ).encode()
+    body = orjson.dumps(envelope)[:-1] + b',"data":' + data + b"}"
+    return Response(content=body, media_type="application/json")
+
+
+def _parse_ts(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse an optional ISO 8601 query timestamp.
+    
+    Args:
+        value: ISO 8601 string or None
+        
+    Returns:
+        Parsed datetime, or None if no value was given
+        
+    Raises:
+        ValueError: If the string is not valid ISO 8601
+    """
+    return ciso8601.parse_datetime(value) if value else None
+
+
 @router.get("/stats")
+@cached(ttl=5)
 async def get_db_stats():
     """
     Get database statistics.
@@ -66,7 +136,7 @@ async def get_db_stats():
     - Database file size
     """
     try:
-        stats = get_database_stats()
+        stats = await asyncio.to_thread(get_database_stats)
         return {
             "status": "ok",
             "stats": stats
@@ -78,10 +148,12 @@ async def get_db_stats():
 
 @router.get("/ticks/{symbol}")
 async def get_historical_ticks(
+    request: Request,
     symbol: str,
     start_time: Optional[str] = Query(None, description="Start time (ISO format)"),
     end_time: Optional[str] = Query(None, description="End time (ISO format)"),
-    limit: Optional[int] = Query(1000, ge=1, le=100000, description="Max rows"),
+    limit: Optional[int] = Query(1000, ge=1, description="Max rows (clamped to the response cell budget)"),
+    fmt: Literal["json", "ndjson"] = Query("json", alias="format", description="Response format"),
 ):
     """
     Get historical tick data for a symbol.
@@ -90,41 +162,80 @@ async def get_historical_ticks(
         symbol: Trading symbol (e.g., BTCUSDT)
         start_time: Optional start time in ISO format
         end_time: Optional end time in ISO format
-        limit: Maximum number of rows (default: 1000)
+        limit: Maximum number of rows (default: 1000); larger requests than
+            the cell budget allows are clamped and flagged with X-Truncated
+        fmt: "json" for a single document, "ndjson" to stream one tick per line
         
     Returns:
         DataFrame as JSON with tick data
     """
     try:
         # Parse timestamps
-        start_dt = datetime.fromisoformat(start_time) if start_time else None
-        end_dt = datetime.fromisoformat(end_time) if end_time else None
+        start_dt = _parse_ts(start_time)
+        end_dt = _parse_ts(end_time)
+        
+        if _tick_query_gate.locked():
+            raise HTTPException(
+                status_code=429,
+                detail="Too many concurrent tick queries, retry shortly",
+                headers={"Retry-After": "1"}
+            )
+        
+        # Cap the row count so a single response stays within the cell budget
+        max_rows = MAX_TICK_CELLS // TICK_COLUMNS
+        truncated = limit is None or limit > max_rows
+        if truncated:
+            limit = max_rows
         
         # Query database
-        df = get_ticks(symbol.upper(), start_dt, end_dt, limit)
+        async with _tick_query_gate:
+            df = await asyncio.to_thread(get_ticks, symbol.upper(), start_dt, end_dt, limit)
+        
+        last_ts = df['timestamp'].max().isoformat() if not df.empty else None
+        etag = make_etag(symbol.upper(), last_ts, len(df))
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        if truncated:
+            headers["X-Truncated"] = "true"
+        
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        
+        if fmt == "ndjson":
+            return StreamingResponse(
+                _iter_ndjson(df),
+                media_type="application/x-ndjson",
+                headers=headers
+            )
         
         if df.empty:
-            return {
+            return Response(
+                content=orjson.dumps({
+                    "status": "ok",
+                    "symbol": symbol,
+                    "count": 0,
+                    "data": []
+                }),
+                media_type="application/json",
+                headers=headers
+            )
+        
+        response = _records_response(
+            {
                 "status": "ok",
                 "symbol": symbol,
-                "count": 0,
-                "data": []
-            }
-        
-        # Convert to JSON-friendly format
-        data = df.to_dict(orient="records")
-        
-        return {
-            "status": "ok",
-            "symbol": symbol,
-            "count": len(data),
-            "time_range": {
-                "start": str(df['timestamp'].min()),
-                "end": str(df['timestamp'].max())
+                "count": len(df),
+                "time_range": {
+                    "start": str(df['timestamp'].min()),
+                    "end": str(df['timestamp'].max())
+                },
             },
-            "data": data
-        }
+            df
+        )
+        response.headers.update(headers)
+        return response
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid timestamp format: {e}")
     except Exception as e:
@@ -150,11 +261,12 @@ async def get_ohlcv_data(request: ResampleRequest):
     """
     try:
         # Parse timestamps
-        start_dt = datetime.fromisoformat(request.start_time) if request.start_time else None
-        end_dt = datetime.fromisoformat(request.end_time) if request.end_time else None
+        start_dt = _parse_ts(request.start_time)
+        end_dt = _parse_ts(request.end_time)
         
         # Get resampled data
-        df = get_resampled_data(
+        df = await asyncio.to_thread(
+            get_resampled_data,
             symbol=request.symbol.upper(),
             timeframe=request.timeframe,
             start_time=start_dt,
@@ -170,20 +282,19 @@ async def get_ohlcv_data(request: ResampleRequest):
                 "data": []
             }
         
-        # Convert to JSON
-        data = df.to_dict(orient="records")
-        
-        return {
-            "status": "ok",
-            "symbol": request.symbol,
-            "timeframe": request.timeframe,
-            "count": len(data),
-            "time_range": {
-                "start": str(df['ts'].min()),
-                "end": str(df['ts'].max())
+        return _records_response(
+            {
+                "status": "ok",
+                "symbol": request.symbol,
+                "timeframe": request.timeframe,
+                "count": len(df),
+                "time_range": {
+                    "start": str(df['ts'].min()),
+                    "end": str(df['ts'].max())
+                },
             },
-            "data": data
-        }
+            df
+        )
         
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid request: {e}")
@@ -195,37 +306,41 @@ async def get_ohlcv_data(request: ResampleRequest):
 @router.post("/export")
 async def export_data(request: ExportRequest):
     """
-    Export resampled data to CSV file.
+    Export resampled data as CSV.
     
-    Returns a downloadable CSV file with OHLCV data.
+    Streams a downloadable CSV with OHLCV data without writing to disk.
     """
     try:
         # Parse timestamps
-        start_dt = datetime.fromisoformat(request.start_time) if request.start_time else None
-        end_dt = datetime.fromisoformat(request.end_time) if request.end_time else None
+        start_dt = _parse_ts(request.start_time)
+        end_dt = _parse_ts(request.end_time)
         
-        # Export to CSV
-        csv_path = export_to_csv(
+        # Get resampled data
+        df = await asyncio.to_thread(
+            get_resampled_data,
             symbol=request.symbol.upper(),
             timeframe=request.timeframe,
             start_time=start_dt,
             end_time=end_dt
         )
         
-        if not csv_path:
+        if df.empty:
             raise HTTPException(status_code=404, detail="No data available to export")
         
-        # Return file for download
-        return FileResponse(
-            path=csv_path,
+        filename = f"{request.symbol}_{request.timeframe}.csv"
+        log.info(f"Streaming {len(df)} rows to {filename}")
+        
+        # Stream CSV chunks straight from the resampled frame
+        return StreamingResponse(
+            _iter_csv(df),
             media_type="text/csv",
-            filename=f"{request.symbol}_{request.timeframe}.csv"
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
         )
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid request: {e}")
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Export file not found")
     except Exception as e:
         log.error(f"Error exporting data for {request.symbol}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -238,6 +353,9 @@ async def cleanup_old_data(
     """
     Delete old tick data to prevent database bloating.
     
+    Free pages are released incrementally; the full VACUUM runs on a
+    daily background schedule (or via /database/vacuum).
+    
     Args:
         hours: Retention period in hours (default: 24, max: 720/30 days)
         
@@ -245,11 +363,8 @@ async def cleanup_old_data(
         Number of rows deleted
     """
     try:
-        deleted_count = delete_old_data(hours)
-        
-        # Optimize database after deletion
-        db = get_db()
-        db.vacuum()
+        deleted_count = await asyncio.to_thread(delete_old_data, hours)
+        get_db_stats.cache_clear()
         
         return {
             "status": "ok",
@@ -272,9 +387,10 @@ async def vacuum_database():
     """
     try:
         db = get_db()
-        db.vacuum()
+        await asyncio.to_thread(db.vacuum)
+        get_db_stats.cache_clear()
         
-        stats = get_database_stats()
+        stats = await asyncio.to_thread(get_database_stats)
         
         return {
             "status": "ok",
@@ -297,7 +413,8 @@ async def clear_database():
     """
     try:
         db = get_db()
-        db.clear_all_data()
+        await asyncio.to_thread(db.clear_all_data)
+        get_db_stats.cache_clear()
         
         return {
             "status": "ok",
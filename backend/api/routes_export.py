@@ -2,49 +2,225 @@
 API routes for data export.
 Endpoints: /export
 """
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import StreamingResponse
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence
+import asyncio
 import io
 import csv
-from datetime import datetime
+import time
+import zlib
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from utils import log, settings
 from core import analytics_engine, data_manager
 
 router = APIRouter(prefix="/export", tags=["export"])
 
+EXPORT_CHUNK_ROWS = 1000
+OHLCV_EXPORT_CHUNK_ROWS = 10_000
+
+OHLCV_COLUMNS = ["ts", "open", "high", "low", "close", "volume"]
+
+# Fastest gzip level: numeric CSV still shrinks several-fold at little CPU cost
+EXPORT_GZIP_LEVEL = 1
+
+EXPORT_FORMATS = ("csv", "parquet")
+
+# Local time suffix for export filenames
+EXPORT_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+
+ANALYTICS_COLUMNS = {
+    "hedge_ratio": "hedge_ratio",
+    "spread": "spread",
+    "zscore": "zscore",
+    "rolling_corr": "rolling_correlation",
+}
+
+
+def _analytics_frame(analytics: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Align the analytics series on their timestamps in a single DataFrame.
+    
+    Series start at different offsets (e.g. zscore needs a full spread
+    window first), so rows are joined by timestamp rather than position.
+    The timestamp column holds tz-aware datetimes.
+    """
+    df = pd.concat(
+        [analytics[key].rename(name) for key, name in ANALYTICS_COLUMNS.items()],
+        axis=1,
+    ).sort_index()
+    df.index = pd.DatetimeIndex(df.index)
+    df.index.name = "timestamp"
+    return df.reset_index()
+
+
+def _analytics_csv_frame(analytics: Dict[str, Any]) -> pd.DataFrame:
+    """Analytics frame with ISO-8601 timestamps, matching the JSON API."""
+    df = _analytics_frame(analytics)
+    df["timestamp"] = [ts.isoformat() for ts in df["timestamp"]]
+    return df
+
+
+def _adf_footer(analytics: Dict[str, Any]) -> List[List[Any]]:
+    """Build the ADF test summary rows appended after the analytics data."""
+    return [
+        [],
+        ["ADF Test Results"],
+        ["P-value", analytics["adf"]["pvalue"]],
+        ["Test Statistic", analytics["adf"]["stat"]],
+        [
+            "Interpretation",
+            "Stationary (mean-reverting)" if analytics["adf"]["pvalue"] < 0.05
+            else "Non-stationary"
+        ],
+    ]
+
+
+def _analytics_parquet(analytics: Dict[str, Any]) -> bytes:
+    """
+    Serialize pair analytics as a zstd-compressed Parquet file.
+    
+    ADF results are stored as key/value schema metadata instead of footer rows.
+    """
+    df = _analytics_frame(analytics)
+    
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b"adf_pvalue": str(analytics["adf"]["pvalue"]).encode(),
+        b"adf_stat": str(analytics["adf"]["stat"]).encode(),
+    })
+    
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, compression="zstd", compression_level=3)
+    return buffer.getvalue()
+
+
+async def _stream_frame_csv(
+    df: pd.DataFrame,
+    footer: Iterable[Sequence[Any]] = (),
+    chunk_rows: int = EXPORT_CHUNK_ROWS
+) -> AsyncIterator[str]:
+    """
+    Yield a DataFrame as CSV in chunks of ``chunk_rows`` rows, then any footer rows.
+    
+    Args:
+        df: Data to export
+        footer: Extra rows written with csv.writer after the data
+        chunk_rows: Number of rows per yielded chunk
+        
+    Yields:
+        CSV text chunks
+    """
+    # Column names are fixed identifiers, so the header needs no CSV quoting
+    yield ",".join(df.columns) + "\r\n"
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows].to_csv(
+            index=False,
+            header=False,
+            lineterminator="\r\n"
+        )
+    
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(footer)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def _stream_ohlcv_csv(
+    ohlcv: List[Dict[str, Any]],
+    chunk_rows: int = OHLCV_EXPORT_CHUNK_ROWS
+) -> AsyncIterator[str]:
+    """
+    Yield OHLCV candles as CSV, converting ``chunk_rows`` candles at a time.
+    
+    Args:
+        ohlcv: Candle dicts with keys ts, open, high, low, close, volume
+        chunk_rows: Number of candles per yielded chunk
+        
+    Yields:
+        CSV text chunks
+    """
+    for start in range(0, len(ohlcv), chunk_rows):
+        df = pd.DataFrame(ohlcv[start:start + chunk_rows], columns=OHLCV_COLUMNS)
+        yield df.rename(columns={"ts": "timestamp"}).to_csv(
+            index=False,
+            header=(start == 0),
+            lineterminator="\r\n"
+        )
+
+
+async def _gzip_stream(chunks: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """Gzip-compress a stream of text chunks."""
+    compressor = zlib.compressobj(EXPORT_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _csv_response(request: Request, chunks: AsyncIterator[str], filename: str) -> StreamingResponse:
+    """
+    Stream CSV chunks as a file download, gzip-encoded if the client accepts it.
+    
+    Args:
+        request: Incoming request (for Accept-Encoding)
+        chunks: CSV text chunks
+        filename: Download filename
+        
+    Returns:
+        StreamingResponse with the CSV body
+    """
+    headers = {
+        "Content-Disposition": f"attachment; filename={filename}",
+        "Vary": "Accept-Encoding",
+    }
+    
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return StreamingResponse(_gzip_stream(chunks), media_type="text/csv", headers=headers)
+    
+    return StreamingResponse(chunks, media_type="text/csv", headers=headers)
+
 
 @router.get("")
 async def export_data(
+    request: Request,
     pair: str = Query(..., description="Pair in format SYMBOL_A-SYMBOL_B"),
     tf: str = Query(default="1m", description="Timeframe"),
-    format: str = Query(default="csv", description="Export format (csv)"),
+    format: str = Query(default="csv", description="Export format (csv, parquet)"),
     window: int = Query(default=60, description="Rolling window size"),
     regression: str = Query(default="OLS", description="Regression method")
 ):
     """
-    Export analytics data as CSV file.
+    Export analytics data as a CSV or Parquet file.
     
     Args:
         pair: Trading pair
         tf: Timeframe
-        format: Export format (currently only csv supported)
+        format: Export format (csv or parquet)
         window: Window size
         regression: Regression method
         
     Returns:
-        CSV file download
+        CSV or Parquet file download
     """
     try:
-        if format.lower() != "csv":
+        export_format = format.lower()
+        if export_format not in EXPORT_FORMATS:
             raise HTTPException(
                 status_code=400,
-                detail="Only CSV format is currently supported"
+                detail=f"Unsupported export format: {format}. Available: {list(EXPORT_FORMATS)}"
             )
         
         # Compute analytics
-        analytics = analytics_engine.compute_pair_analytics(
+        analytics = await asyncio.to_thread(
+            analytics_engine.compute_pair_series,
             pair=pair,
             timeframe=tf,
             window=window,
@@ -57,85 +233,24 @@ async def export_data(
                 detail="No data available for export"
             )
         
-        # Prepare CSV data
-        csv_buffer = io.StringIO()
-        writer = csv.writer(csv_buffer)
-        
-        # Write header
-        writer.writerow([
-            "timestamp",
-            "hedge_ratio",
-            "spread",
-            "zscore",
-            "rolling_correlation"
-        ])
-        
-        # Find the maximum length among all series
-        max_len = max(
-            len(analytics.get("hedge_ratio", [])),
-            len(analytics.get("spread", [])),
-            len(analytics.get("zscore", [])),
-            len(analytics.get("rolling_corr", []))
-        )
-        
-        # Write rows
-        for i in range(max_len):
-            hedge_ratio_val = (
-                analytics["hedge_ratio"][i]["value"]
-                if i < len(analytics.get("hedge_ratio", []))
-                else ""
-            )
-            spread_val = (
-                analytics["spread"][i]["value"]
-                if i < len(analytics.get("spread", []))
-                else ""
-            )
-            zscore_val = (
-                analytics["zscore"][i]["value"]
-                if i < len(analytics.get("zscore", []))
-                else ""
-            )
-            corr_val = (
-                analytics["rolling_corr"][i]["value"]
-                if i < len(analytics.get("rolling_corr", []))
-                else ""
-            )
-            
-            # Use timestamp from first available series
-            ts = ""
-            if i < len(analytics.get("hedge_ratio", [])):
-                ts = analytics["hedge_ratio"][i]["ts"]
-            elif i < len(analytics.get("spread", [])):
-                ts = analytics["spread"][i]["ts"]
-            elif i < len(analytics.get("zscore", [])):
-                ts = analytics["zscore"][i]["ts"]
-            elif i < len(analytics.get("rolling_corr", [])):
-                ts = analytics["rolling_corr"][i]["ts"]
-            
-            writer.writerow([ts, hedge_ratio_val, spread_val, zscore_val, corr_val])
-        
-        # Add ADF test results as footer
-        writer.writerow([])
-        writer.writerow(["ADF Test Results"])
-        writer.writerow(["P-value", analytics["adf"]["pvalue"]])
-        writer.writerow(["Test Statistic", analytics["adf"]["stat"]])
-        writer.writerow([
-            "Interpretation",
-            "Stationary (mean-reverting)" if analytics["adf"]["pvalue"] < 0.05
-            else "Non-stationary"
-        ])
-        
         # Create response
-        csv_buffer.seek(0)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{pair.replace('-', '_')}_{tf}_{timestamp}.csv"
+        timestamp = time.strftime(EXPORT_TIMESTAMP_FORMAT)
+        filename = f"{pair.replace('-', '_')}_{tf}_{timestamp}.{export_format}"
         
         log.info(f"Exporting data to {filename}")
         
-        return StreamingResponse(
-            iter([csv_buffer.getvalue()]),
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        if export_format == "parquet":
+            body = await asyncio.to_thread(_analytics_parquet, analytics)
+            return Response(
+                content=body,
+                media_type="application/vnd.apache.parquet",
+                headers={"Content-Disposition": f"attachment; filename={filename}"}
+            )
+        
+        return _csv_response(
+            request,
+            _stream_frame_csv(_analytics_csv_frame(analytics), _adf_footer(analytics)),
+            filename
         )
     
     except HTTPException:
@@ -147,6 +262,7 @@ async def export_data(
 
 @router.get("/ohlcv")
 async def export_ohlcv(
+    request: Request,
     symbol: str = Query(..., description="Trading symbol"),
     tf: str = Query(default="1m", description="Timeframe"),
     limit: Optional[int] = Query(default=None, description="Maximum rows")
@@ -172,35 +288,16 @@ async def export_ohlcv(
                 detail="No data available for export"
             )
         
-        # Prepare CSV
-        csv_buffer = io.StringIO()
-        writer = csv.writer(csv_buffer)
-        
-        # Write header
-        writer.writerow(["timestamp", "open", "high", "low", "close", "volume"])
-        
-        # Write data
-        for candle in ohlcv:
-            writer.writerow([
-                candle["ts"],
-                candle["open"],
-                candle["high"],
-                candle["low"],
-                candle["close"],
-                candle["volume"]
-            ])
-        
         # Create response
-        csv_buffer.seek(0)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime(EXPORT_TIMESTAMP_FORMAT)
         filename = f"{symbol}_{tf}_ohlcv_{timestamp}.csv"
         
         log.info(f"Exporting OHLCV to {filename}")
         
-        return StreamingResponse(
-            iter([csv_buffer.getvalue()]),
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        return _csv_response(
+            request,
+            _stream_ohlcv_csv(ohlcv),
+            filename
         )
     
     except HTTPException:
@@ -4,11 +4,11 @@ Endpoints: /stream/start, /stream/stop, /ws
 """
 from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, Body
 from pydantic import BaseModel, Field
-from typing import List, Dict, Set
+from typing import Awaitable, Callable, List, Dict, Set
 import asyncio
-import json
+import orjson
 
-from utils import log, normalize_symbol, settings
+from utils import log, normalize_symbol, settings, cached
 from core import data_manager, alerts_engine, analytics_engine
 from core.websocket_client import WebSocketManager
 
@@ -17,12 +17,24 @@ router = APIRouter(prefix="/stream", tags=["stream"])
 # Global WebSocket manager for Binance streams
 ws_manager: WebSocketManager = None
 
-# Active frontend WebSocket connections
+# Active frontend WebSocket connections. Only add/discard mutate the set;
+# senders iterate a tuple snapshot (see _broadcast) so clients can come and
+# go while a fan-out is in flight
 frontend_connections: Set[WebSocket] = set()
 
 # Redis pub/sub listener task
 redis_pubsub_task: asyncio.Task = None
 
+# Trades are coalesced into one "trades" frame per flush instead of one
+# frame per tick; flushed every TICK_FLUSH_INTERVAL or at TICK_BATCH_SIZE
+TICK_FLUSH_INTERVAL = 0.02
+TICK_BATCH_SIZE = 64
+_tick_buffer: List[str] = []
+
+# Per-symbol '{"symbol":"...",' prefixes for pre-encoded trade items
+_TICK_PREFIX: Dict[str, str] = {}
+_tick_flush_task: asyncio.Task = None
+
 
 class StreamStartRequest(BaseModel):
     """Request model for starting streams."""
@@ -35,6 +47,51 @@ class StreamStopRequest(BaseModel):
     symbols: List[str] = Field(..., description="List of symbols to stop")
 
 
+def _dumps(payload: Dict) -> str:
+    """Serialize a message payload with orjson."""
+    return orjson.dumps(payload).decode()
+
+
+async def _broadcast(payload: Dict):
+    """
+    Serialize a message once and send it to all frontend clients concurrently.
+    
+    Clients whose send fails are dropped from the connection set.
+    
+    Args:
+        payload: Message to broadcast
+    """
+    if not frontend_connections:
+        return
+    
+    await _send_all(_dumps(payload))
+
+
+async def _send_all(message: str):
+    """
+    Send an already-serialized message to all frontend clients concurrently.
+    
+    Clients whose send fails are dropped from the connection set.
+    
+    Args:
+        message: JSON text to send
+    """
+    if not frontend_connections:
+        return
+    
+    # Snapshot: clients may connect or disconnect while sends are in flight
+    connections = tuple(frontend_connections)
+    results = await asyncio.gather(
+        *(websocket.send_text(message) for websocket in connections),
+        return_exceptions=True
+    )
+    
+    for websocket, result in zip(connections, results):
+        if isinstance(result, Exception):
+            log.error(f"Error sending to WebSocket: {result}")
+            frontend_connections.discard(websocket)
+
+
 async def handle_tick(tick: Dict):
     """
     Callback for handling incoming ticks from Binance WebSocket.
@@ -42,28 +99,66 @@ async def handle_tick(tick: Dict):
     """
     # Store tick
     await data_manager.add_tick(tick)
+    alerts_engine.notify_data_updated()
     
-    # Broadcast to all connected frontend clients
-    if frontend_connections:
-        message = json.dumps({
-            "type": "trade",
-            "symbol": tick["symbol"],
-            "price": tick["price"],
-            "qty": tick["qty"],
-            "ts": tick["ts"]
-        })
-        
-        # Send to all connections
-        disconnected = set()
-        for websocket in frontend_connections:
-            try:
-                await websocket.send_text(message)
-            except Exception as e:
-                log.error(f"Error sending to WebSocket: {e}")
-                disconnected.add(websocket)
-        
-        # Remove disconnected clients
-        frontend_connections.difference_update(disconnected)
+    if not frontend_connections:
+        return
+    
+    # Queue for the next batched broadcast to frontend clients. Trade items
+    # have a fixed shape (float price/qty, ISO ts), so encode them directly
+    # from a cached per-symbol prefix instead of building and dumping a dict
+    symbol = tick["symbol"]
+    prefix = _TICK_PREFIX.get(symbol)
+    if prefix is None:
+        prefix = _TICK_PREFIX[symbol] = f'{{"symbol":{_dumps(symbol)},'
+    _tick_buffer.append(
+        f'{prefix}"price":{tick["price"]!r},"qty":{tick["qty"]!r},"ts":"{tick["ts"]}"}}'
+    )
+    
+    if len(_tick_buffer) >= TICK_BATCH_SIZE:
+        await _flush_ticks()
+
+
+async def _flush_ticks():
+    """Broadcast buffered trades as a single "trades" frame."""
+    if not _tick_buffer:
+        return
+    
+    items = _tick_buffer.copy()
+    _tick_buffer.clear()
+    
+    await _send_all('{"type":"trades","items":[' + ",".join(items) + "]}")
+
+
+async def _tick_flush_loop():
+    """Background task flushing buffered trades every TICK_FLUSH_INTERVAL."""
+    while True:
+        try:
+            await asyncio.sleep(TICK_FLUSH_INTERVAL)
+            await _flush_ticks()
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            log.error(f"Error flushing trades: {e}")
+
+
+def start_tick_flush():
+    """Start the trade batching task if it isn't running."""
+    global _tick_flush_task
+    if _tick_flush_task is None or _tick_flush_task.done():
+        _tick_flush_task = asyncio.create_task(_tick_flush_loop())
+
+
+async def stop_tick_flush():
+    """Stop the trade batching task."""
+    global _tick_flush_task
+    if _tick_flush_task is not None:
+        _tick_flush_task.cancel()
+        try:
+            await _tick_flush_task
+        except asyncio.CancelledError:
+            pass
+        _tick_flush_task = None
 
 
 async def handle_ticker(ticker: Dict):
@@ -71,58 +166,30 @@ async def handle_ticker(ticker: Dict):
     Callback for handling 24h ticker updates from Binance WebSocket.
     Broadcasts 24h statistics to frontend clients.
     """
-    # Broadcast 24h ticker stats to all connected frontend clients
-    if frontend_connections:
-        message = json.dumps({
-            "type": "ticker",
-            "symbol": ticker["symbol"],
-            "priceChange": ticker["priceChange"],
-            "priceChangePercent": ticker["priceChangePercent"],
-            "lastPrice": ticker["lastPrice"],
-            "openPrice": ticker["openPrice"],
-            "highPrice": ticker["highPrice"],
-            "lowPrice": ticker["lowPrice"],
-            "volume": ticker["volume"],
-            "quoteVolume": ticker["quoteVolume"],
-            "ts": ticker["ts"]
-        })
-        
-        # Send to all connections
-        disconnected = set()
-        for websocket in frontend_connections:
-            try:
-                await websocket.send_text(message)
-            except Exception as e:
-                log.error(f"Error sending ticker to WebSocket: {e}")
-                disconnected.add(websocket)
-        
-        # Remove disconnected clients
-        frontend_connections.difference_update(disconnected)
+    if not frontend_connections:
+        return
+    
+    # Broadcast 24h ticker stats to all connected frontend clients. The
+    # ticker dict already holds exactly the frontend fields, in order
+    await _broadcast({"type": "ticker", **ticker})
 
 
 async def broadcast_alert(notification):
     """Broadcast alert notification to frontend clients."""
-    if frontend_connections:
-        message = json.dumps({
-            "type": "alert",
-            "id": notification.id,
-            "alert_id": notification.alert_id,
-            "message": notification.message,
-            "metric": notification.metric,
-            "pair": notification.pair,
-            "actual_value": notification.actual_value,
-            "threshold_value": notification.threshold_value,
-            "ts": notification.ts
-        })
-        
-        disconnected = set()
-        for websocket in frontend_connections:
-            try:
-                await websocket.send_text(message)
-            except Exception:
-                disconnected.add(websocket)
-        
-        frontend_connections.difference_update(disconnected)
+    if not frontend_connections:
+        return
+    
+    await _broadcast({
+        "type": "alert",
+        "id": notification.id,
+        "alert_id": notification.alert_id,
+        "message": notification.message,
+        "metric": notification.metric,
+        "pair": notification.pair,
+        "actual_value": notification.actual_value,
+        "threshold_value": notification.threshold_value,
+        "ts": notification.ts
+    })
 
 
 def initialize_ws_manager():
@@ -131,6 +198,8 @@ def initialize_ws_manager():
     if ws_manager is None:
         ws_manager = WebSocketManager(on_tick=handle_tick, on_ticker=handle_ticker)
         log.info("Initialized Binance WebSocket Manager with ticker support")
+    
+    start_tick_flush()
 
 
 async def start_redis_pubsub_listener():
@@ -147,6 +216,49 @@ async def stop_redis_pubsub_listener():
     return
 
 
+async def _handle_subscribe(websocket: WebSocket, message: Dict):
+    """Subscribe to Binance streams for the requested symbols."""
+    symbols = message.get("symbols", [])
+    if symbols:
+        initialize_ws_manager()
+        await ws_manager.subscribe_multiple(symbols)
+        
+        await websocket.send_text(_dumps({
+            "type": "subscription",
+            "status": "subscribed",
+            "symbols": symbols
+        }))
+        
+        log.info(f"Frontend subscribed to: {symbols}")
+
+
+async def _handle_unsubscribe(websocket: WebSocket, message: Dict):
+    """Unsubscribe from Binance streams for the requested symbols."""
+    symbols = message.get("symbols", [])
+    if symbols and ws_manager:
+        await ws_manager.unsubscribe_multiple(symbols)
+        
+        await websocket.send_text(_dumps({
+            "type": "subscription",
+            "status": "unsubscribed",
+            "symbols": symbols
+        }))
+        
+        log.info(f"Frontend unsubscribed from: {symbols}")
+
+
+async def _handle_ping(websocket: WebSocket, message: Dict):
+    """Answer a heartbeat."""
+    await websocket.send_text(_dumps({"type": "pong"}))
+
+
+# Frontend message action -> handler
+_HANDLERS: Dict[str, Callable[[WebSocket, Dict], Awaitable[None]]] = {
+    "subscribe": _handle_subscribe,
+    "unsubscribe": _handle_unsubscribe,
+    "ping": _handle_ping,
+}
+
 
 @router.post("/start")
 async def start_stream(request: StreamStartRequest = Body(...)):
@@ -165,7 +277,7 @@ async def start_stream(request: StreamStartRequest = Body(...)):
         # Validate symbols
         invalid_symbols = [
             s for s in request.symbols
-            if normalize_symbol(s) not in settings.symbols_list
+            if normalize_symbol(s) not in settings.symbols_set
         ]
         
         if invalid_symbols:
@@ -233,6 +345,7 @@ async def stop_stream(request: StreamStopRequest = Body(...)):
 
 
 @router.get("/status")
+@cached(ttl=0.5)
 async def get_stream_status():
     """
     Get current stream status.
@@ -271,7 +384,7 @@ async def websocket_endpoint(websocket: WebSocket):
     - Unsubscribe: {"action": "unsubscribe", "symbols": ["ETHUSDT"]}
     
     Broadcasts:
-    - Tick: {"type": "trade", "symbol": "BTCUSDT", "price": 34000, ...}
+    - Trades: {"type": "trades", "items": [{"symbol": "BTCUSDT", "price": 34000, ...}]}
     - Alert: {"type": "alert", "id": "...", "message": "..."}
     """
     await websocket.accept()
@@ -285,43 +398,12 @@ async def websocket_endpoint(websocket: WebSocket):
             data = await websocket.receive_text()
             
             try:
-                message = json.loads(data)
-                action = message.get("action")
-                
-                if action == "subscribe":
-                    symbols = message.get("symbols", [])
-                    if symbols:
-                        initialize_ws_manager()
-                        await ws_manager.subscribe_multiple(symbols)
-                        
-                        response = json.dumps({
-                            "type": "subscription",
-                            "status": "subscribed",
-                            "symbols": symbols
-                        })
-                        await websocket.send_text(response)
-                        
-                        log.info(f"Frontend subscribed to: {symbols}")
-                
-                elif action == "unsubscribe":
-                    symbols = message.get("symbols", [])
-                    if symbols and ws_manager:
-                        await ws_manager.unsubscribe_multiple(symbols)
-                        
-                        response = json.dumps({
-                            "type": "subscription",
-                            "status": "unsubscribed",
-                            "symbols": symbols
-                        })
-                        await websocket.send_text(response)
-                        
-                        log.info(f"Frontend unsubscribed from: {symbols}")
-                
-                elif action == "ping":
-                    # Heartbeat
-                    await websocket.send_text(json.dumps({"type": "pong"}))
+                message = orjson.loads(data)
+                handler = _HANDLERS.get(message.get("action"))
+                if handler:
+                    await handler(websocket, message)
             
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 log.error(f"Invalid JSON from frontend: {data}")
             except Exception as e:
                 log.error(f"Error handling frontend message: {e}")
@@ -335,7 +417,7 @@ async def websocket_endpoint(websocket: WebSocket):
         log.info(f"Frontend WebSocket removed. Remaining: {len(frontend_connections)}")
         
         # Stop Redis pub/sub listener if this was the last connection
-        if len(frontend_connections) == 0:
+        if not frontend_connections:
             await stop_redis_pubsub_listener()
 
 
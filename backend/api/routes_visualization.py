@@ -1,10 +1,13 @@
 """Visualization endpoints providing Plotly-ready chart specifications."""
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Optional, Sequence
 
 import pandas as pd
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
+from plotly.io.json import to_json_plotly
 
 from utils import log, settings, normalize_symbol
 from core import data_manager
@@ -22,11 +25,9 @@ _PALETTE = [
 ]
 
 
-def _parse_ma_specs(ma_param: Optional[str]) -> Optional[Sequence[MovingAverageSpec]]:
-    """Parse a comma-delimited moving-average window string."""
-    if not ma_param:
-        return None
-
+@lru_cache(maxsize=64)
+def _parse_ma_specs_cached(ma_param: str) -> tuple[MovingAverageSpec, ...]:
+    """Parse a comma-delimited moving-average window string, raising ValueError."""
     specs: list[MovingAverageSpec] = []
     for idx, token in enumerate(ma_param.split(",")):
         token = token.strip()
@@ -35,21 +36,68 @@ def _parse_ma_specs(ma_param: Optional[str]) -> Optional[Sequence[MovingAverageS
         try:
             window = int(token)
         except ValueError:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid moving average window: '{token}'"
-            )
+            raise ValueError(f"Invalid moving average window: '{token}'") from None
         if window <= 0:
-            raise HTTPException(
-                status_code=400,
-                detail="Moving average windows must be positive integers",
-            )
+            raise ValueError("Moving average windows must be positive integers")
         color = _PALETTE[idx % len(_PALETTE)]
         specs.append(MovingAverageSpec(window=window, name=f"MA {window}", color=color))
 
+    return tuple(specs)
+
+
+def _parse_ma_specs(ma_param: Optional[str]) -> Optional[Sequence[MovingAverageSpec]]:
+    """Parse a comma-delimited moving-average window string."""
+    if not ma_param:
+        return None
+
+    try:
+        specs = _parse_ma_specs_cached(ma_param)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
     return specs if specs else None
 
 
+@lru_cache(maxsize=64)
+def _render_chart(
+    rows: tuple[tuple, ...],
+    tf: str,
+    ma_specs: Optional[tuple[MovingAverageSpec, ...]],
+    title: str,
+) -> bytes:
+    """Render (ts, open, high, low, close, volume) rows as UTF-8 Plotly figure JSON."""
+    # Build the columns plot_candles expects in one pass over the rows
+    ts, opens, highs, lows, closes, volumes = zip(*rows)
+    df = pd.DataFrame(
+        {
+            "timestamp": ts,
+            "open": opens,
+            "high": highs,
+            "low": lows,
+            "close": closes,
+            "volume": volumes,
+        },
+        copy=False,
+    )
+
+    # A live chart usually differs from its previous render only in the
+    # newest candle, which plot_candles can then patch into the old figure
+    figure = (
+        plot_candles(df, timeframe=tf, moving_averages=ma_specs, reuse_figure=True)
+        if ma_specs
+        else plot_candles(df, timeframe=tf, reuse_figure=True)
+    )
+
+    payload = figure.to_dict()
+    payload.setdefault("layout", {})
+    payload["layout"].setdefault("title", {"text": title})
+
+    # to_dict() keeps NumPy arrays (including object/datetime ones) that
+    # jsonable_encoder can't walk; Plotly's orjson engine encodes them natively.
+    # Cache bytes so cache hits go out as-is without re-encoding the text
+    return to_json_plotly(payload, engine="orjson").encode()
+
+
 @router.get("/candles/{symbol}")
 async def get_candlestick_chart(
     symbol: str,
@@ -63,13 +111,13 @@ async def get_candlestick_chart(
 
     normalized = normalize_symbol(symbol)
 
-    if normalized not in settings.symbols_list:
+    if normalized not in settings.symbols_set:
         raise HTTPException(
             status_code=400,
             detail=f"Symbol {normalized} not supported. Available: {settings.symbols_list}",
         )
 
-    if tf not in settings.resample_intervals_list:
+    if tf not in settings.resample_intervals_set:
         raise HTTPException(
             status_code=400,
             detail=f"Timeframe {tf} not supported. Available: {settings.resample_intervals_list}",
@@ -86,34 +134,21 @@ async def get_candlestick_chart(
     if not candles:
         raise HTTPException(status_code=404, detail="No OHLCV data available")
 
-    df = pd.DataFrame(candles)
-    if df.empty:
-        raise HTTPException(status_code=404, detail="No OHLCV data available")
-
-    if "volume" not in df.columns:
-        df["volume"] = 0.0
-
-    df = df.rename(columns={"ts": "timestamp"})
-
-    # Ensure column ordering expected by plot_candles
-    df = df[["timestamp", "open", "high", "low", "close", "volume"]]
-
     ma_specs = _parse_ma_specs(ma)
 
+    # Charts only change when a candle does, so identical candle tuples reuse
+    # the rendered JSON instead of rebuilding the figure
+    rows = tuple(
+        (c["ts"], c["open"], c["high"], c["low"], c["close"], c.get("volume", 0.0))
+        for c in candles
+    )
+
     try:
-        figure = (
-            plot_candles(df, timeframe=tf, moving_averages=ma_specs)
-            if ma_specs
-            else plot_candles(df, timeframe=tf)
-        )
+        content = _render_chart(rows, tf, ma_specs, f"{normalized} @ {tf}")
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:  # pragma: no cover - defensive logging
         log.exception("Failed to build candlestick figure")
         raise HTTPException(status_code=500, detail="Failed to render chart") from exc
 
-    payload = figure.to_dict()
-    payload.setdefault("layout", {})
-    payload["layout"].setdefault("title", {"text": f"{normalized} @ {tf}"})
-
-    return payload
+    return Response(content=content, media_type="application/json")
@@ -6,9 +6,9 @@ import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 
-from utils import log, settings
+from utils import log, settings, cached
 from core import data_manager, alerts_engine
 from api import (
     data_router,
@@ -39,22 +39,28 @@ async def lifespan(app: FastAPI):
     log.info(f"Available symbols: {settings.symbols_list}")
     log.info(f"Timeframes: {settings.resample_intervals_list}")
     log.info(f"CORS origins: {settings.cors_origins_list}")
+    log.info(f"Event loop: {type(asyncio.get_running_loop()).__module__}")
     
     # Initialize database
     log.info("Initializing SQLite database...")
-    from core.db import init_db
-    init_db()
+    from core.db import init_db, vacuum_loop, tick_flush_loop
+    await asyncio.to_thread(init_db)
     log.info("✓ Database initialized")
     
     # Start background tasks
     log.info("Starting background tasks...")
     
-    # 1. Periodic resampling task
-    resample_task = asyncio.create_task(data_manager.resample_loop(interval=60))
-    background_tasks.append(resample_task)
-    log.info("✓ Started periodic resampling task (60s interval)")
+    # 1. Daily database vacuum task
+    vacuum_task = asyncio.create_task(vacuum_loop(interval=86400))
+    background_tasks.append(vacuum_task)
+    log.info("✓ Started daily database vacuum task")
     
-    # 2. Alert monitoring task
+    # 2. Batched tick persistence task
+    flush_task = asyncio.create_task(tick_flush_loop())
+    background_tasks.append(flush_task)
+    log.info("✓ Started tick flush task (500ms interval)")
+    
+    # 3. Alert monitoring task
     await alerts_engine.start_monitoring(interval=0.5)
     log.info("✓ Started alert monitoring task (500ms interval)")
     
@@ -83,12 +89,19 @@ async def lifespan(app: FastAPI):
                 pass
     log.info("✓ Cancelled background tasks")
     
-    # Cleanup WebSocket connections
-    from api.routes_stream import ws_manager
+    # Cleanup WebSocket connections first so no tick is queued after the
+    # final database flush
+    from api.routes_stream import ws_manager, stop_tick_flush
+    await stop_tick_flush()
     if ws_manager:
         await ws_manager.disconnect_all()
         log.info("✓ Closed Binance WebSocket connections")
     
+    # Write queued ticks and close pooled database connections
+    from core.db import get_db
+    await asyncio.to_thread(get_db().close)
+    log.info("✓ Closed database connections")
+    
     log.info("=" * 60)
     log.info("Shutdown complete")
     log.info("=" * 60)
@@ -100,6 +113,7 @@ app = FastAPI(
     description="Real-time quantitative trading analytics with Binance Futures data",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
 )
@@ -142,6 +156,7 @@ async def root():
 
 
 @app.get("/health", tags=["health"])
+@cached(ttl=0.5)
 async def health_check():
     """Detailed health check endpoint."""
     from api.routes_stream import ws_manager
@@ -151,7 +166,7 @@ async def health_check():
         "binance_ws_active": ws_manager.get_active_symbols() if ws_manager else [],
         "data_buffer_stats": data_manager.get_statistics(),
         "active_alerts": len(alerts_engine.get_active_alerts()),
-        "triggered_alerts": len(alerts_engine.get_triggered_alerts()),
+        "triggered_alerts": len(alerts_engine.triggered_alerts),
     }
 
 
@@ -3,15 +3,50 @@ Alerts engine for monitoring trading conditions and triggering notifications.
 Supports user-defined alert rules based on metrics and thresholds.
 """
 import asyncio
+import itertools
+import operator
+from collections import deque
+from itertools import islice
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any, Callable
+from typing import Deque, Dict, List, Optional, Any, Callable, Tuple
 from dataclasses import dataclass, field
+from functools import lru_cache
 from uuid import uuid4
 
 from utils import log
 from core.analytics import analytics_engine
 
 
+# Alert comparison operators; "==" allows for float rounding
+_OPERATORS: Dict[str, Callable[[float, float], bool]] = {
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "==": lambda actual, threshold: abs(actual - threshold) < 1e-6,
+}
+
+# Most recent alert notifications kept in memory
+MAX_TRIGGERED_HISTORY = 10_000
+
+# Notification IDs: one random prefix per process plus a counter, so
+# triggers don't pay for a uuid4 each while staying unique across restarts
+_NOTIFICATION_ID_PREFIX = uuid4().hex[:8]
+_notification_ids = itertools.count(1)
+
+
+def _next_notification_id() -> str:
+    """Return a process-unique alert notification ID."""
+    return f"{_NOTIFICATION_ID_PREFIX}-{next(_notification_ids):x}"
+
+
+@lru_cache(maxsize=1024)
+def _pair_legs(pair: str) -> Optional[Tuple[str, str]]:
+    """Split a SYMBOL_A-SYMBOL_B pair once per distinct pair string."""
+    legs = pair.split("-")
+    return (legs[0], legs[1]) if len(legs) == 2 else None
+
+
 @dataclass
 class Alert:
     """Alert rule definition."""
@@ -53,11 +88,20 @@ class AlertsEngine:
     def __init__(self):
         """Initialize alerts engine."""
         self.alerts: Dict[str, Alert] = {}
-        self.triggered_alerts: List[AlertNotification] = []
+        # Secondary index: alerts on the same pair share one metrics lookup
+        self._alerts_by_pair: Dict[str, List[Alert]] = {}
+        # Last pair metrics, keyed by pair, with the tick versions of both
+        # legs they were computed from
+        self._pair_metrics: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        self.triggered_alerts: Deque[AlertNotification] = deque(maxlen=MAX_TRIGGERED_HISTORY)
         self.callbacks: List[Callable] = []
         self.monitoring_task: Optional[asyncio.Task] = None
         self.is_monitoring = False
         
+        # Set when new market data arrives (or alerts change) so the monitor
+        # only re-checks alerts when their inputs may have changed
+        self.data_updated = asyncio.Event()
+        
         log.info("Alerts Engine initialized")
     
     def add_alert(
@@ -87,7 +131,9 @@ class AlertsEngine:
         )
         
         self.alerts[alert.id] = alert
-        log.info(f"Added alert {alert.id}: {metric} {operator} {value} for {pair}")
+        self._alerts_by_pair.setdefault(alert.pair, []).append(alert)
+        self.data_updated.set()
+        log.info("Added alert {}: {} {} {} for {}", alert.id, metric, operator, value, pair)
         
         return alert
     
@@ -102,8 +148,13 @@ class AlertsEngine:
             True if removed, False if not found
         """
         if alert_id in self.alerts:
-            del self.alerts[alert_id]
-            log.info(f"Removed alert {alert_id}")
+            alert = self.alerts.pop(alert_id)
+            bound = self._alerts_by_pair[alert.pair]
+            bound.remove(alert)
+            if not bound:
+                del self._alerts_by_pair[alert.pair]
+                self._pair_metrics.pop(alert.pair, None)
+            log.info("Removed alert {}", alert_id)
             return True
         return False
     
@@ -130,8 +181,9 @@ class AlertsEngine:
             List of alert notifications
         """
         if limit:
-            return self.triggered_alerts[-limit:]
-        return self.triggered_alerts
+            # Walk back from the newest entry: O(limit), not O(history)
+            return list(islice(reversed(self.triggered_alerts), limit))[::-1]
+        return list(self.triggered_alerts)
     
     def clear_triggered_alerts(self):
         """Clear triggered alerts history."""
@@ -147,19 +199,35 @@ class AlertsEngine:
         """
         self.callbacks.append(callback)
     
-    async def check_alert(self, alert: Alert) -> Optional[AlertNotification]:
+    def notify_data_updated(self):
+        """Wake the alert monitor: new ticks have been ingested."""
+        self.data_updated.set()
+    
+    async def check_alert(
+        self,
+        alert: Alert,
+        analytics_cache: Optional[Dict[str, Any]] = None,
+        ts: Optional[str] = None
+    ) -> Optional[AlertNotification]:
         """
         Check if an alert condition is met.
         
         Args:
             alert: Alert to check
+            analytics_cache: Pair metrics computed earlier in the same
+                monitoring pass, keyed by pair (filled in on a miss)
+            ts: ISO timestamp of the monitoring pass (defaults to now)
             
         Returns:
             AlertNotification if triggered, None otherwise
         """
         try:
             # Get current value for the metric
-            actual_value = await self._get_metric_value(alert.metric, alert.pair)
+            actual_value = await self._get_metric_value(
+                alert.metric,
+                alert.pair,
+                analytics_cache
+            )
             
             if actual_value is None:
                 return None
@@ -174,29 +242,62 @@ class AlertsEngine:
             if triggered:
                 # Create notification
                 notification = AlertNotification(
-                    id=str(uuid4()),
+                    id=_next_notification_id(),
                     alert_id=alert.id,
                     message=f"{alert.metric} {alert.operator} {alert.value} for {alert.pair}",
                     metric=alert.metric,
                     pair=alert.pair,
                     actual_value=actual_value,
-                    threshold_value=alert.value
+                    threshold_value=alert.value,
+                    ts=ts or datetime.now(timezone.utc).isoformat()
                 )
                 
                 # Update alert
                 alert.triggered_at = notification.ts
                 alert.trigger_count += 1
                 
-                log.info(f"Alert triggered: {notification.message} (actual: {actual_value})")
+                log.info("Alert triggered: {} (actual: {})", notification.message, actual_value)
                 
                 return notification
         
         except Exception as e:
-            log.error(f"Error checking alert {alert.id}: {e}")
+            log.error("Error checking alert {}: {}", alert.id, e)
         
         return None
     
-    async def _get_metric_value(self, metric: str, pair: str) -> Optional[float]:
+    async def _check_pair_alerts(
+        self,
+        alerts: List[Alert],
+        ts: Optional[str] = None
+    ) -> List[AlertNotification]:
+        """
+        Check all active alerts bound to one pair against a shared metrics lookup.
+        
+        The metric lookups are synchronous computations and never yield to the
+        event loop, so callers should check pairs in turn rather than fan out.
+        
+        Args:
+            alerts: Alerts on the same pair
+            ts: ISO timestamp of the monitoring pass
+            
+        Returns:
+            Notifications for the alerts that triggered, in alert order
+        """
+        analytics_cache: Dict[str, Any] = {}
+        notifications = []
+        for alert in alerts:
+            if alert.active:
+                notification = await self.check_alert(alert, analytics_cache, ts)
+                if notification:
+                    notifications.append(notification)
+        return notifications
+    
+    async def _get_metric_value(
+        self,
+        metric: str,
+        pair: str,
+        analytics_cache: Optional[Dict[str, Any]] = None
+    ) -> Optional[float]:
         """Get current value for a metric."""
         from core.data_manager import data_manager
         
@@ -208,68 +309,85 @@ class AlertsEngine:
                 return data_manager.get_latest_price(pair)
             
             elif metric in ["zscore", "spread", "correlation"]:
-                # Pair metrics - compute analytics
-                analytics = analytics_engine.compute_pair_analytics(
-                    pair=pair,
-                    timeframe="1m",
-                    window=60,
-                    regression="OLS"
-                )
-                
-                if not analytics:
+                # Pair metrics - compute latest values once per pair per pass
+                legs = _pair_legs(pair)
+                if legs is None:
+                    log.error("Invalid pair format: {}", pair)
                     return None
                 
-                if metric == "zscore" and analytics.get("zscore"):
-                    values = analytics["zscore"]
-                    return values[-1]["value"] if values else None
+                if analytics_cache is not None and pair in analytics_cache:
+                    metrics = analytics_cache[pair]
+                else:
+                    # Skip the recompute when neither leg has new ticks
+                    versions = (
+                        data_manager.tick_versions.get(legs[0], 0),
+                        data_manager.tick_versions.get(legs[1], 0),
+                    )
+                    cached = self._pair_metrics.get(pair)
+                    if cached is not None and cached[0] == versions:
+                        metrics = cached[1]
+                    else:
+                        metrics = analytics_engine.compute_latest_metrics(
+                            symbol_a=legs[0],
+                            symbol_b=legs[1],
+                            timeframe="1m",
+                            window=60,
+                            regression="OLS"
+                        )
+                        if pair in self._alerts_by_pair:
+                            self._pair_metrics[pair] = (versions, metrics)
+                    if analytics_cache is not None:
+                        analytics_cache[pair] = metrics
                 
-                elif metric == "spread" and analytics.get("spread"):
-                    values = analytics["spread"]
-                    return values[-1]["value"] if values else None
-                
-                elif metric == "correlation" and analytics.get("rolling_corr"):
-                    values = analytics["rolling_corr"]
-                    return values[-1]["value"] if values else None
+                return metrics.get(metric)
         
         except Exception as e:
-            log.error(f"Error getting metric value for {metric} @ {pair}: {e}")
+            log.error("Error getting metric value for {} @ {}: {}", metric, pair, e)
         
         return None
     
     def _evaluate_condition(self, actual: float, operator: str, threshold: float) -> bool:
         """Evaluate alert condition."""
-        if operator == ">":
-            return actual > threshold
-        elif operator == "<":
-            return actual < threshold
-        elif operator == ">=":
-            return actual >= threshold
-        elif operator == "<=":
-            return actual <= threshold
-        elif operator == "==":
-            return abs(actual - threshold) < 1e-6
-        else:
-            return False
+        compare = _OPERATORS.get(operator)
+        return compare(actual, threshold) if compare else False
     
-    async def monitor_alerts(self, interval: float = 0.5):
+    async def monitor_alerts(self, interval: float = 0.5, max_interval: float = 5.0):
         """
         Background task to monitor all alerts.
         
+        Alerts are re-checked when notify_data_updated() signals new data,
+        at most once per ``interval`` and at least once per ``max_interval``.
+        
         Args:
-            interval: Check interval in seconds (default 500ms)
+            interval: Minimum seconds between checks (default 500ms)
+            max_interval: Maximum seconds between checks without new data
         """
         self.is_monitoring = True
-        log.info(f"Started alert monitoring (interval: {interval}s)")
+        log.info("Started alert monitoring (interval: {}s)", interval)
         
         while self.is_monitoring:
             try:
-                # Check all active alerts
-                active_alerts = self.get_active_alerts()
+                self.data_updated.clear()
+                
+                # Check alerts grouped by pair: metrics are computed once per
+                # pair, not once per alert
+                pairs = list(self._alerts_by_pair.items())
+                
+                # One timestamp for every notification raised in this pass
+                pass_ts = datetime.now(timezone.utc).isoformat()
+                
+                # Pair checks never yield, so gathering them would only add
+                # task overhead: run them in turn, isolating errors per pair;
+                # callbacks run once every pair is checked
+                results = []
+                for pair, alerts in pairs:
+                    try:
+                        results.append(await self._check_pair_alerts(list(alerts), pass_ts))
+                    except Exception as e:
+                        log.error("Error checking alerts for {}: {}", pair, e)
                 
-                for alert in active_alerts:
-                    notification = await self.check_alert(alert)
-                    
-                    if notification:
+                for notifications in results:
+                    for notification in notifications:
                         # Store notification
                         self.triggered_alerts.append(notification)
                         
@@ -278,15 +396,21 @@ class AlertsEngine:
                             try:
                                 await callback(notification)
                             except Exception as e:
-                                log.error(f"Error in alert callback: {e}")
+                                log.error("Error in alert callback: {}", e)
                 
+                # Throttle, then sleep until new data arrives (or the fallback
+                # timeout) instead of re-scanning unchanged inputs
                 await asyncio.sleep(interval)
+                try:
+                    await asyncio.wait_for(self.data_updated.wait(), timeout=max_interval)
+                except asyncio.TimeoutError:
+                    pass
             
             except asyncio.CancelledError:
                 log.info("Alert monitoring cancelled")
                 break
             except Exception as e:
-                log.error(f"Error in alert monitoring loop: {e}")
+                log.error("Error in alert monitoring loop: {}", e)
                 await asyncio.sleep(interval)
     
     async def start_monitoring(self, interval: float = 0.5):
@@ -2,16 +2,52 @@
 Analytics engine for quantitative trading calculations.
 Computes hedge ratios, spreads, z-scores, correlations, and statistical tests.
 """
+from functools import lru_cache
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple, Any
 from scipy import stats
 from statsmodels.tsa.stattools import adfuller
-from statsmodels.regression.linear_model import OLS
 from sklearn.linear_model import HuberRegressor, TheilSenRegressor
 
-from utils import log, safe_division
+from utils import log
 from core.data_manager import data_manager
+from core.kernels import rolling_ols_beta, rolling_zscore, rolling_corr
+
+# Series-valued entries of compute_pair_series results
+PAIR_SERIES_KEYS = ("hedge_ratio", "spread", "zscore", "rolling_corr")
+
+
+def _to_points(series: pd.Series) -> List[Dict[str, Any]]:
+    """Convert a timestamp-indexed Series to a list of {ts, value} dicts."""
+    return [
+        {"ts": ts.isoformat(), "value": value}
+        for ts, value in zip(series.index, series.tolist())
+    ]
+
+
+def _last_value(series: pd.Series) -> Optional[float]:
+    """Return the last value of a Series, or None if it is empty."""
+    return float(series.iloc[-1]) if len(series) else None
+
+
+
+@lru_cache(maxsize=512)
+def _adf_cached(spread_bytes: bytes) -> Dict[str, float]:
+    """ADF test on float64 spread values packed as bytes (hashable cache key)."""
+    spread_values = np.frombuffer(spread_bytes, dtype=np.float64)
+    
+    try:
+        # Perform ADF test
+        result = adfuller(spread_values, autolag='AIC')
+        
+        return {
+            "stat": float(result[0]),      # Test statistic
+            "pvalue": float(result[1]),    # P-value
+        }
+    except Exception as e:
+        log.error(f"Error in ADF test: {e}")
+        return {"pvalue": 1.0, "stat": 0.0}
 
 
 class AnalyticsEngine:
@@ -30,55 +66,52 @@ class AnalyticsEngine:
         """Initialize analytics engine."""
         log.info("Analytics Engine initialized")
     
-    def compute_hedge_ratio(
+    def _pair_frame(
         self,
         symbol_a: str,
         symbol_b: str,
-        timeframe: str = "1m",
-        window: int = 60,
-        method: str = "OLS"
-    ) -> List[Dict[str, Any]]:
+        timeframe: str,
+        window: int,
+        force_resample: bool = True
+    ) -> pd.DataFrame:
         """
-        Compute rolling hedge ratio between two symbols.
+        Fetch both close series and align them on timestamp.
         
         Args:
-            symbol_a: First symbol (dependent variable)
-            symbol_b: Second symbol (independent variable)
+            symbol_a: First symbol
+            symbol_b: Second symbol
             timeframe: Data timeframe
-            window: Rolling window size
-            method: Regression method (OLS, Huber, Theil-Sen, Kalman)
+            window: Rolling window size (sets how much history is fetched)
+            force_resample: Resample ticks instead of reading cached OHLCV
             
         Returns:
-            List of {ts, value} dictionaries
+            DataFrame with columns a, b indexed by timestamp
         """
-        # Get price series
+        limit = max(window * 3, window + 20)
         prices_a = data_manager.get_price_series(
             symbol_a,
             timeframe,
-            limit=max(window * 3, window + 20),
-            force_resample=True,
+            limit=limit,
+            force_resample=force_resample,
         )
         prices_b = data_manager.get_price_series(
             symbol_b,
             timeframe,
-            limit=max(window * 3, window + 20),
-            force_resample=True,
+            limit=limit,
+            force_resample=force_resample,
         )
         
-        if min(len(prices_a), len(prices_b)) < 2:
-            log.warning(
-                "Not enough price data for hedge ratio: {}/{} window={} len_a={} len_b={}",
-                symbol_a,
-                symbol_b,
-                window,
-                len(prices_a),
-                len(prices_b),
-            )
-            return []
-        
-        # Align series
-        df = pd.DataFrame({'a': prices_a, 'b': prices_b}).dropna()
-        
+        return pd.DataFrame({'a': prices_a, 'b': prices_b}).dropna()
+    
+    def _hedge_ratio_series(
+        self,
+        df: pd.DataFrame,
+        symbol_a: str,
+        symbol_b: str,
+        window: int,
+        method: str
+    ) -> pd.Series:
+        """Rolling hedge ratio of a on b, indexed by window end timestamp."""
         if len(df) < 2:
             log.warning(
                 "Aligned price frame too small for hedge ratio: {}/{} window={} len_df={}",
@@ -87,7 +120,7 @@ class AnalyticsEngine:
                 window,
                 len(df),
             )
-            return []
+            return pd.Series(dtype=float)
 
         effective_window = min(window, len(df))
 
@@ -100,52 +133,168 @@ class AnalyticsEngine:
                 effective_window,
             )
         
+        method_upper = method.upper()
+        
+        if method_upper in ("OLS", "KALMAN"):
+            # Simplified Kalman - use OLS for now
+            ratios = rolling_ols_beta(
+                df['a'].to_numpy(dtype=np.float64),
+                df['b'].to_numpy(dtype=np.float64),
+                effective_window,
+            )
+            return pd.Series(
+                ratios[effective_window - 1:],
+                index=df.index[effective_window - 1:],
+            )
+        
+        # Slice NumPy views instead of building a DataFrame per window
+        values_a = df['a'].to_numpy(dtype=np.float64)
+        # Regressor column shaped as an (n, 1) design matrix once; each
+        # window's fit gets a row slice of it instead of a fresh array
+        design_b = df['b'].to_numpy(dtype=np.float64).reshape(-1, 1)
+        
+        timestamps = []
         hedge_ratios = []
         
         # Rolling window calculation
         for i in range(effective_window, len(df) + 1):
-            window_data = df.iloc[i-effective_window:i]
+            window_a = values_a[i-effective_window:i]
+            window_b = design_b[i-effective_window:i]
             
             try:
-                if method.upper() == "OLS":
-                    ratio = self._ols_hedge_ratio(
-                        window_data['a'].values,
-                        window_data['b'].values
-                    )
-                elif method.upper() == "HUBER":
-                    ratio = self._huber_hedge_ratio(
-                        window_data['a'].values,
-                        window_data['b'].values
-                    )
-                elif method.upper() == "THEIL-SEN":
-                    ratio = self._theilsen_hedge_ratio(
-                        window_data['a'].values,
-                        window_data['b'].values
-                    )
-                elif method.upper() == "KALMAN":
-                    # Simplified Kalman - use OLS for now
-                    ratio = self._ols_hedge_ratio(
-                        window_data['a'].values,
-                        window_data['b'].values
-                    )
+                if method_upper == "HUBER":
+                    ratio = self._huber_hedge_ratio(window_a, window_b)
+                elif method_upper == "THEIL-SEN":
+                    ratio = self._theilsen_hedge_ratio(window_a, window_b)
                 else:
                     ratio = 1.0
                 
-                hedge_ratios.append({
-                    "ts": window_data.index[-1].isoformat(),
-                    "value": float(ratio)
-                })
+                timestamps.append(df.index[i - 1])
+                hedge_ratios.append(float(ratio))
             except Exception as e:
                 log.error(f"Error computing hedge ratio at index {i}: {e}")
                 continue
         
-        return hedge_ratios
+        return pd.Series(hedge_ratios, index=pd.DatetimeIndex(timestamps), dtype=float)
     
-    def _ols_hedge_ratio(self, y: np.ndarray, x: np.ndarray) -> float:
-        """OLS regression to compute hedge ratio."""
-        x_with_const = np.column_stack([np.ones(len(x)), x])
-        model = OLS(y, x_with_const).fit()
-        return model.params[1]
+    def _zscore_series(
+        self,
+        spread: pd.Series,
+        symbol_a: str,
+        symbol_b: str,
+        window: int
+    ) -> pd.Series:
+        """Rolling z-score of a spread series, dropping warm-up NaNs."""
+        if len(spread) < 2:
+            log.warning(
+                "Insufficient spread history for zscore: {}/{} window={} len_spreads={}",
+                symbol_a,
+                symbol_b,
+                window,
+                len(spread),
+            )
+            return pd.Series(dtype=float)
+
+        effective_window = min(window, len(spread))
+
+        if effective_window < window:
+            log.debug(
+                "Using reduced window for zscore: {}/{} requested={} effective={}",
+                symbol_a,
+                symbol_b,
+                window,
+                effective_window,
+            )
+        
+        # Rolling z-score
+        zscores = rolling_zscore(
+            spread.to_numpy(dtype=np.float64),
+            effective_window,
+        )
+        
+        # Drop warm-up NaNs with a NumPy mask before wrapping in a Series
+        valid = ~np.isnan(zscores)
+        return pd.Series(zscores[valid], index=spread.index[valid])
+    
+    def _compute_pair_core(
+        self,
+        df: pd.DataFrame,
+        symbol_a: str,
+        symbol_b: str,
+        window: int = 60,
+        method: str = "OLS",
+        with_zscore: bool = True
+    ) -> Dict[str, pd.Series]:
+        """
+        Compute hedge ratio, spread and z-score in one pass over an aligned frame.
+        
+        Spread = Price_A - (Hedge_Ratio * Price_B)
+        Z-Score = (Spread - Mean(Spread)) / StdDev(Spread)
+        
+        Args:
+            df: Aligned prices from _pair_frame
+            symbol_a: First symbol (dependent variable)
+            symbol_b: Second symbol (independent variable)
+            window: Rolling window size
+            method: Regression method (OLS, Huber, Theil-Sen, Kalman)
+            with_zscore: Also compute the z-score series
+            
+        Returns:
+            Dict of timestamp-indexed Series: hedge_ratio, spread and
+            (if requested) zscore
+        """
+        hedge_ratio = self._hedge_ratio_series(df, symbol_a, symbol_b, window, method)
+        
+        if hedge_ratio.empty:
+            log.warning(
+                "No hedge ratios computed for spread: {}/{} window={}",
+                symbol_a,
+                symbol_b,
+                window,
+            )
+            spread = pd.Series(dtype=float)
+        else:
+            # Hedge ratios normally cover the trailing rows of df, so the
+            # spread is plain array arithmetic on the tail; fall back to a
+            # label join if any robust-regression window was skipped
+            aligned = df.iloc[len(df) - len(hedge_ratio):]
+            if not aligned.index.equals(hedge_ratio.index):
+                aligned = df.loc[hedge_ratio.index]
+            spread = pd.Series(
+                aligned['a'].to_numpy() - hedge_ratio.to_numpy() * aligned['b'].to_numpy(),
+                index=hedge_ratio.index,
+            )
+        
+        core = {"hedge_ratio": hedge_ratio, "spread": spread}
+        if with_zscore:
+            core["zscore"] = self._zscore_series(spread, symbol_a, symbol_b, window)
+        return core
+    
+    def compute_hedge_ratio(
+        self,
+        symbol_a: str,
+        symbol_b: str,
+        timeframe: str = "1m",
+        window: int = 60,
+        method: str = "OLS",
+        force_resample: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Compute rolling hedge ratio between two symbols.
+        
+        Args:
+            symbol_a: First symbol (dependent variable)
+            symbol_b: Second symbol (independent variable)
+            timeframe: Data timeframe
+            window: Rolling window size
+            method: Regression method (OLS, Huber, Theil-Sen, Kalman)
+            force_resample: Resample ticks instead of reading cached OHLCV
+            
+        Returns:
+            List of {ts, value} dictionaries
+        """
+        df = self._pair_frame(symbol_a, symbol_b, timeframe, window, force_resample)
+        return _to_points(self._hedge_ratio_series(df, symbol_a, symbol_b, window, method))
     
     def _huber_hedge_ratio(self, y: np.ndarray, x: np.ndarray) -> float:
         """Huber regression (robust) to compute hedge ratio."""
@@ -165,7 +314,8 @@ class AnalyticsEngine:
         symbol_b: str,
         timeframe: str = "1m",
         window: int = 60,
-        method: str = "OLS"
+        method: str = "OLS",
+        force_resample: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Compute spread between two symbols using hedge ratio.
@@ -178,54 +328,16 @@ class AnalyticsEngine:
             timeframe: Data timeframe
             window: Rolling window for hedge ratio
             method: Regression method
+            force_resample: Resample ticks instead of reading cached OHLCV
             
         Returns:
             List of {ts, value} dictionaries
         """
-        # Get hedge ratios
-        hedge_ratios = self.compute_hedge_ratio(
-            symbol_a, symbol_b, timeframe, window, method
-        )
-        
-        if not hedge_ratios:
-            log.warning(
-                "No hedge ratios computed for spread: {}/{} window={}",
-                symbol_a,
-                symbol_b,
-                window,
-            )
-            return []
-        
-        # Get price series
-        prices_a = data_manager.get_price_series(
-            symbol_a,
-            timeframe,
-            limit=max(window * 3, window + 20),
-            force_resample=True,
-        )
-        prices_b = data_manager.get_price_series(
-            symbol_b,
-            timeframe,
-            limit=max(window * 3, window + 20),
-            force_resample=True,
+        df = self._pair_frame(symbol_a, symbol_b, timeframe, window, force_resample)
+        core = self._compute_pair_core(
+            df, symbol_a, symbol_b, window, method, with_zscore=False
         )
-        
-        # Compute spread
-        spreads = []
-        for hr in hedge_ratios:
-            ts = pd.Timestamp(hr["ts"])
-            
-            if ts not in prices_a.index or ts not in prices_b.index:
-                continue
-            
-            spread = prices_a[ts] - (hr["value"] * prices_b[ts])
-            
-            spreads.append({
-                "ts": ts.isoformat(),
-                "value": float(spread)
-            })
-        
-        return spreads
+        return _to_points(core["spread"])
     
     def compute_zscore(
         self,
@@ -233,7 +345,8 @@ class AnalyticsEngine:
         symbol_b: str,
         timeframe: str = "1m",
         window: int = 60,
-        method: str = "OLS"
+        method: str = "OLS",
+        force_resample: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Compute z-score of the spread.
@@ -246,63 +359,22 @@ class AnalyticsEngine:
             timeframe: Data timeframe
             window: Rolling window size
             method: Regression method
+            force_resample: Resample ticks instead of reading cached OHLCV
             
         Returns:
             List of {ts, value} dictionaries
         """
-        spreads = self.compute_spread(symbol_a, symbol_b, timeframe, window, method)
-        
-        if len(spreads) < 2:
-            log.warning(
-                "Insufficient spread history for zscore: {}/{} window={} len_spreads={}",
-                symbol_a,
-                symbol_b,
-                window,
-                len(spreads),
-            )
-            return []
-        
-        # Convert to pandas Series
-        df = pd.DataFrame(spreads)
-        df['ts'] = pd.to_datetime(df['ts'])
-        df = df.set_index('ts')
-
-        effective_window = min(window, len(df))
-
-        if effective_window < window:
-            log.debug(
-                "Using reduced window for zscore: {}/{} requested={} effective={}",
-                symbol_a,
-                symbol_b,
-                window,
-                effective_window,
-            )
-        
-        # Rolling z-score
-        rolling_mean = df['value'].rolling(window=effective_window, min_periods=effective_window).mean()
-        rolling_std = df['value'].rolling(window=effective_window, min_periods=effective_window).std()
-        
-        z_scores = []
-        for idx in df.index:
-            if pd.notna(rolling_mean[idx]) and pd.notna(rolling_std[idx]):
-                zscore = safe_division(
-                    df['value'][idx] - rolling_mean[idx],
-                    rolling_std[idx],
-                    default=0.0
-                )
-                z_scores.append({
-                    "ts": idx.isoformat(),
-                    "value": float(zscore)
-                })
-        
-        return z_scores
+        df = self._pair_frame(symbol_a, symbol_b, timeframe, window, force_resample)
+        core = self._compute_pair_core(df, symbol_a, symbol_b, window, method)
+        return _to_points(core["zscore"])
     
     def compute_rolling_correlation(
         self,
         symbol_a: str,
         symbol_b: str,
         timeframe: str = "1m",
-        window: int = 60
+        window: int = 60,
+        force_resample: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Compute rolling correlation between two symbols.
@@ -312,27 +384,22 @@ class AnalyticsEngine:
             symbol_b: Second symbol
             timeframe: Data timeframe
             window: Rolling window size
+            force_resample: Resample ticks instead of reading cached OHLCV
             
         Returns:
             List of {ts, value} dictionaries
         """
-        # Get price series
-        prices_a = data_manager.get_price_series(
-            symbol_a,
-            timeframe,
-            limit=max(window * 3, window + 20),
-            force_resample=True,
-        )
-        prices_b = data_manager.get_price_series(
-            symbol_b,
-            timeframe,
-            limit=max(window * 3, window + 20),
-            force_resample=True,
-        )
-        
-        # Align series
-        df = pd.DataFrame({'a': prices_a, 'b': prices_b}).dropna()
-        
+        df = self._pair_frame(symbol_a, symbol_b, timeframe, window, force_resample)
+        return _to_points(self._rolling_correlation_series(df, symbol_a, symbol_b, window))
+    
+    def _rolling_correlation_series(
+        self,
+        df: pd.DataFrame,
+        symbol_a: str,
+        symbol_b: str,
+        window: int
+    ) -> pd.Series:
+        """Rolling correlation of an aligned price frame, dropping warm-up NaNs."""
         if len(df) < 2:
             log.warning(
                 "Insufficient overlapping prices for rolling corr: {}/{} window={} len_df={}",
@@ -341,7 +408,7 @@ class AnalyticsEngine:
                 window,
                 len(df),
             )
-            return []
+            return pd.Series(dtype=float)
 
         effective_window = min(window, len(df))
 
@@ -355,20 +422,13 @@ class AnalyticsEngine:
             )
         
         # Rolling correlation
-        rolling_corr = df['a'].rolling(
-            window=effective_window,
-            min_periods=effective_window,
-        ).corr(df['b'])
-        
-        correlations = []
-        for idx, corr in rolling_corr.items():
-            if pd.notna(corr):
-                correlations.append({
-                    "ts": idx.isoformat(),
-                    "value": float(corr)
-                })
-        
-        return correlations
+        correlations = rolling_corr(
+            df['a'].to_numpy(dtype=np.float64),
+            df['b'].to_numpy(dtype=np.float64),
+            effective_window,
+        )
+        
+        return pd.Series(correlations, index=df.index).dropna()
     
     def compute_adf_test(
         self,
@@ -376,7 +436,8 @@ class AnalyticsEngine:
         symbol_b: str,
         timeframe: str = "1m",
         window: int = 60,
-        method: str = "OLS"
+        method: str = "OLS",
+        force_resample: bool = True
     ) -> Dict[str, float]:
         """
         Perform Augmented Dickey-Fuller test on the spread.
@@ -388,45 +449,47 @@ class AnalyticsEngine:
             timeframe: Data timeframe
             window: Window for hedge ratio
             method: Regression method
+            force_resample: Resample ticks instead of reading cached OHLCV
             
         Returns:
             Dict with pvalue and stat
         """
-        spreads = self.compute_spread(symbol_a, symbol_b, timeframe, window, method)
-        
-        if len(spreads) < 20:  # Minimum required for ADF test
+        df = self._pair_frame(symbol_a, symbol_b, timeframe, window, force_resample)
+        core = self._compute_pair_core(
+            df, symbol_a, symbol_b, window, method, with_zscore=False
+        )
+        return self._adf_test(core["spread"])
+    
+    def _adf_test(self, spread: pd.Series) -> Dict[str, float]:
+        """Run the ADF test on a spread series (see compute_adf_test)."""
+        if len(spread) < 20:  # Minimum required for ADF test
             return {"pvalue": 1.0, "stat": 0.0}
         
-        # Extract spread values
-        spread_values = [s["value"] for s in spreads]
-        
-        try:
-            # Perform ADF test
-            result = adfuller(spread_values, autolag='AIC')
-            
-            return {
-                "stat": float(result[0]),      # Test statistic
-                "pvalue": float(result[1]),    # P-value
-            }
-        except Exception as e:
-            log.error(f"Error in ADF test: {e}")
-            return {"pvalue": 1.0, "stat": 0.0}
+        # Keyed by the raw spread bytes: only recomputed when a value changes.
+        # Copy so callers can annotate the result without touching the cache
+        return dict(_adf_cached(spread.to_numpy(dtype=np.float64).tobytes()))
     
-    def compute_pair_analytics(
+    def compute_pair_series(
         self,
         pair: str,
         timeframe: str = "1m",
         window: int = 60,
-        regression: str = "OLS"
+        regression: str = "OLS",
+        force_resample: bool = True
     ) -> Dict[str, Any]:
         """
-        Compute comprehensive analytics for a trading pair.
+        Compute comprehensive analytics for a trading pair as pandas Series.
+        
+        Same contract as compute_pair_analytics, but hedge_ratio, spread,
+        zscore and rolling_corr are timestamp-indexed Series, for consumers
+        (e.g. exports) that work column-wise.
         
         Args:
             pair: Pair string in format "SYMBOL_A-SYMBOL_B"
             timeframe: Data timeframe
             window: Rolling window size
             regression: Regression method
+            force_resample: Resample ticks instead of reading cached OHLCV
             
         Returns:
             Dict with all analytics (hedge_ratio, spread, zscore, correlation, adf)
@@ -441,34 +504,129 @@ class AnalyticsEngine:
         log.info(f"Computing analytics for {pair} @ {timeframe}")
         
         try:
-            # Compute all analytics
-            hedge_ratio = self.compute_hedge_ratio(
-                symbol_a, symbol_b, timeframe, window, regression
-            )
-            spread = self.compute_spread(
-                symbol_a, symbol_b, timeframe, window, regression
-            )
-            zscore = self.compute_zscore(
-                symbol_a, symbol_b, timeframe, window, regression
-            )
-            rolling_corr = self.compute_rolling_correlation(
-                symbol_a, symbol_b, timeframe, window
-            )
-            adf = self.compute_adf_test(
-                symbol_a, symbol_b, timeframe, window, regression
-            )
+            # Fetch and align once, then derive every metric from the same frame
+            df = self._pair_frame(symbol_a, symbol_b, timeframe, window, force_resample)
+            core = self._compute_pair_core(df, symbol_a, symbol_b, window, regression)
             
             return {
                 "pair": pair,
-                "hedge_ratio": hedge_ratio,
-                "spread": spread,
-                "zscore": zscore,
-                "rolling_corr": rolling_corr,
-                "adf": adf,
+                "hedge_ratio": core["hedge_ratio"],
+                "spread": core["spread"],
+                "zscore": core["zscore"],
+                "rolling_corr": self._rolling_correlation_series(
+                    df, symbol_a, symbol_b, window
+                ),
+                "adf": self._adf_test(core["spread"]),
             }
         except Exception as e:
             log.error(f"Error computing pair analytics: {e}")
             return {"pair": pair, "error": str(e)}
+    
+    def compute_pair_analytics(
+        self,
+        pair: str,
+        timeframe: str = "1m",
+        window: int = 60,
+        regression: str = "OLS",
+        force_resample: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Compute comprehensive analytics for a trading pair.
+        
+        Args:
+            pair: Pair string in format "SYMBOL_A-SYMBOL_B"
+            timeframe: Data timeframe
+            window: Rolling window size
+            regression: Regression method
+            force_resample: Resample ticks instead of reading cached OHLCV
+            
+        Returns:
+            Dict with all analytics (hedge_ratio, spread, zscore, correlation, adf)
+        """
+        analytics = self.compute_pair_series(
+            pair, timeframe, window, regression, force_resample
+        )
+        
+        if not analytics or "error" in analytics:
+            return analytics
+        
+        # Series become lists of {ts, value} points only at the API boundary
+        for key in PAIR_SERIES_KEYS:
+            analytics[key] = _to_points(analytics[key])
+        
+        return analytics
+    
+    def compute_latest_metrics(
+        self,
+        symbol_a: str,
+        symbol_b: str,
+        timeframe: str = "1m",
+        window: int = 60,
+        regression: str = "OLS",
+        force_resample: bool = True
+    ) -> Dict[str, Optional[float]]:
+        """
+        Compute only the most recent spread, z-score and correlation for a pair.
+        
+        Point-in-time consumers such as alert checks need just the latest
+        values, so this skips the ADF test and the per-point list conversion
+        of compute_pair_analytics. The z-score itself comes from the
+        sliding-window Welford kernel (O(1) per bar).
+        
+        Args:
+            symbol_a: First symbol
+            symbol_b: Second symbol
+            timeframe: Data timeframe
+            window: Rolling window size
+            regression: Regression method
+            force_resample: Resample ticks instead of reading cached OHLCV
+            
+        Returns:
+            Dict with spread, zscore and correlation (None where unavailable)
+        """
+        df = self._pair_frame(symbol_a, symbol_b, timeframe, window, force_resample)
+        core = self._compute_pair_core(df, symbol_a, symbol_b, window, regression)
+        correlation = self._rolling_correlation_series(df, symbol_a, symbol_b, window)
+        
+        return {
+            "spread": _last_value(core["spread"]),
+            "zscore": _last_value(core["zscore"]),
+            "correlation": _last_value(correlation),
+        }
+    
+    def compute_batch_analytics(
+        self,
+        items: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Compute analytics for several pairs, resampling each symbol only once.
+        
+        Args:
+            items: List of dicts with keys pair, timeframe, window, regression
+            
+        Returns:
+            List of analytics dicts in the same order as items
+        """
+        # Refresh each (symbol, timeframe) once so every pair reads the
+        # same cached OHLCV frame instead of resampling per computation
+        series_keys = set()
+        for item in items:
+            for symbol in item["pair"].split("-"):
+                series_keys.add((symbol, item["timeframe"]))
+        
+        for symbol, timeframe in series_keys:
+            data_manager.get_price_series(symbol, timeframe, force_resample=True)
+        
+        return [
+            self.compute_pair_analytics(
+                pair=item["pair"],
+                timeframe=item["timeframe"],
+                window=item["window"],
+                regression=item["regression"],
+                force_resample=False,
+            )
+            for item in items
+        ]
 
 
 # Global analytics engine instance
@@ -3,20 +3,197 @@ Data Manager for tick buffering, resampling, and storage.
 Maintains in-memory tick buffers with Redis caching layer.
 """
 import asyncio
-from collections import defaultdict, deque
+import time
+from collections import defaultdict
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+import numpy as np
 import pandas as pd
 from threading import Lock
 
 from utils import (
     log,
+    LRUCache,
     normalize_symbol,
-    resample_to_ohlcv,
+    iso_to_epoch_ns,
+    epoch_ns_to_iso,
+    resample_arrays_to_ohlcv,
     timeframe_to_pandas_rule,
+    pandas_rule_to_ns,
     settings,
 )
 
+# Maximum get_ohlcv calls resampling in worker threads at once
+OHLCV_MAX_THREADS = 8
+
+
+class TickBuffer:
+    """
+    Fixed-capacity ring buffer of ticks stored as parallel NumPy arrays.
+    
+    Timestamps are int64 nanoseconds since the epoch; prices and quantities
+    are float64. Once full, each append overwrites the oldest tick.
+    
+    There is a single writer (the event loop) and no lock: writes bump
+    ``seq`` to an odd value while in progress, and readers on worker
+    threads retry a snapshot until they see the same even ``seq`` before
+    and after copying (a seqlock).
+    
+    ``appended`` counts every tick ever written and ``generation`` every
+    clear, so a reader can tell which ticks are new since a snapshot.
+    """
+    
+    def __init__(self, capacity: int):
+        """Preallocate storage for ``capacity`` ticks."""
+        self.capacity = capacity
+        self.ts = np.empty(capacity, dtype=np.int64)
+        self.price = np.empty(capacity, dtype=np.float64)
+        self.qty = np.empty(capacity, dtype=np.float64)
+        self.head = 0  # next slot to write
+        self.count = 0
+        self.seq = 0
+        self.appended = 0
+        self.generation = 0
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def append(self, ts_ns: int, price: float, qty: float):
+        """Write one tick into the next slot."""
+        self.seq += 1
+        head = self.head
+        self.ts[head] = ts_ns
+        self.price[head] = price
+        self.qty[head] = qty
+        self.head = (head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        self.appended += 1
+        self.seq += 1
+    
+    def clear(self):
+        """Drop all ticks (storage is kept)."""
+        self.seq += 1
+        self.head = 0
+        self.count = 0
+        self.generation += 1
+        self.seq += 1
+    
+    def last_price(self) -> Optional[float]:
+        """Price of the most recent tick, or None when empty."""
+        if not self.count:
+            return None
+        return float(self.price[self.head - 1])
+    
+    def arrays(self, last: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Copy out (ts, price, qty) in arrival order, oldest first."""
+        return self.snapshot(last)[:3]
+    
+    def snapshot(
+        self,
+        last: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int, int]:
+        """
+        Consistent copy of (ts, price, qty, appended, generation).
+        
+        Args:
+            last: Copy only the most recent ``last`` ticks (default: all)
+        """
+        while True:
+            seq = self.seq
+            if not seq & 1:
+                snapshot = self._copy(last)
+                if self.seq == seq:
+                    return snapshot
+            # A write is in progress: let the event loop finish it
+            time.sleep(0)
+    
+    def _copy(
+        self,
+        last: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int, int]:
+        """Unsynchronized copy of the buffered ticks (see snapshot)."""
+        head, count = self.head, self.count
+        n = count if last is None else min(last, count)
+        start = head - n  # oldest slot to copy; negative means it wraps
+        if start >= 0:
+            ts, price, qty = (
+                arr[start:head].copy()
+                for arr in (self.ts, self.price, self.qty)
+            )
+        else:
+            ts, price, qty = (
+                np.concatenate((arr[self.capacity + start:], arr[:head]))
+                for arr in (self.ts, self.price, self.qty)
+            )
+        return ts, price, qty, self.appended, self.generation
+
+
+_EMPTY_TICKS = TickBuffer(0)
+
+
+def _bucket_starts(ts: np.ndarray, period_ns: int) -> np.ndarray:
+    """Start (ns) of each distinct bucket touched by time-sorted ticks."""
+    buckets = ts // period_ns
+    keep = np.empty(len(buckets), dtype=bool)
+    keep[:1] = True
+    np.not_equal(buckets[1:], buckets[:-1], out=keep[1:])
+    return buckets[keep] * period_ns
+
+
+def _extend_ohlcv(
+    cached: pd.DataFrame,
+    bucket_starts: np.ndarray,
+    ts: np.ndarray,
+    price: np.ndarray,
+    qty: np.ndarray,
+    new_ticks: int,
+    period_ns: int,
+    pandas_rule: str
+) -> Optional[Tuple[pd.DataFrame, np.ndarray]]:
+    """
+    Bring a cached OHLCV frame up to date with the current tick snapshot.
+    
+    Only the first bar (whose oldest ticks may have been evicted) and the
+    bars from the cached frame's last bucket onward (which received the new
+    ticks) are resampled; bars in between are reused as they are.
+    
+    Args:
+        cached: Frame built from an earlier, time-sorted snapshot
+        bucket_starts: Bucket start (ns) of each row of ``cached``
+        ts, price, qty: Current time-sorted snapshot
+        new_ticks: Ticks appended since ``cached`` was built
+        period_ns: Bucket size in nanoseconds
+        pandas_rule: Pandas resample rule for ``period_ns``
+        
+    Returns:
+        (frame, bucket_starts), or None when a full resample is needed
+    """
+    # Zero prices are back-filled across bars, so reused bars could change
+    if new_ticks <= 0 or new_ticks >= len(ts) or not price.all():
+        return None
+    
+    first_bucket = ts[0] // period_ns * period_ns
+    last_bucket = bucket_starts[-1]
+    if first_bucket >= last_bucket or ts[-new_ticks] < last_bucket:
+        return None
+    
+    head_end = np.searchsorted(ts, first_bucket + period_ns)
+    tail_start = np.searchsorted(ts, last_bucket)
+    lo = np.searchsorted(bucket_starts, first_bucket, side='right')
+    hi = np.searchsorted(bucket_starts, last_bucket)
+    
+    head = resample_arrays_to_ohlcv(ts[:head_end], price[:head_end], qty[:head_end], pandas_rule)
+    tail = resample_arrays_to_ohlcv(ts[tail_start:], price[tail_start:], qty[tail_start:], pandas_rule)
+    
+    df = pd.concat([head, cached.iloc[lo:hi], tail], ignore_index=True)
+    starts = np.concatenate((
+        [first_bucket],
+        bucket_starts[lo:hi],
+        _bucket_starts(ts[tail_start:], period_ns),
+    ))
+    return df, starts
+
 
 class DataManager:
     """
@@ -24,7 +201,7 @@ class DataManager:
     
     Features:
     - Redis-first caching for tick data (when enabled)
-    - Fallback in-memory buffers (deques)
+    - Fallback in-memory buffers (NumPy ring buffers)
     - Real-time OHLCV resampling (1s, 1m, 5m)
     - Thread-safe operations
     - Automatic Redis persistence
@@ -32,21 +209,47 @@ class DataManager:
     
     def __init__(self):
         """Initialize data manager with empty buffers."""
-        # Tick buffers: symbol -> deque of tick dicts (fallback)
-        self.tick_buffers: Dict[str, deque] = defaultdict(
-            lambda: deque(maxlen=settings.tick_buffer_size)
+        # Tick buffers: symbol -> ring buffer of (ts, price, qty) arrays
+        self.tick_buffers: Dict[str, TickBuffer] = defaultdict(
+            lambda: TickBuffer(settings.tick_buffer_size)
         )
         
-        # Resampled OHLCV cache: (symbol, timeframe) -> DataFrame
-        self.ohlcv_cache: Dict[tuple, pd.DataFrame] = {}
+        # Resampled OHLCV cache: (symbol, timeframe) -> DataFrame, bounded
+        # LRU; evicting a frame drops its companion entries below
+        self.ohlcv_cache: LRUCache = LRUCache(
+            settings.ohlcv_cache_size, on_evict=self._forget_ohlcv
+        )
+        self.ohlcv_refreshed_at: Dict[tuple, float] = {}
+        
+        # Tick buffer versions: bumped on every change to a symbol's buffer.
+        # ohlcv_versions records the version a cached frame was built from,
+        # so forced resamples can reuse frames whose ticks haven't changed
+        self.tick_versions: Dict[str, int] = defaultdict(int)
+        self.ohlcv_versions: Dict[tuple, int] = {}
+        
+        # Incremental resampling state of version-tagged frames:
+        # (buffer generation, ticks appended, bucket start ns of each row)
+        self.ohlcv_state: Dict[tuple, Tuple[int, int, np.ndarray]] = {}
         
-        # Locks for thread-safe operations
-        self.tick_locks: Dict[str, Lock] = defaultdict(Lock)
+        # Read-only close series published per cached frame, keyed like
+        # ohlcv_cache and stored with the frame they were built from
+        self.close_series: Dict[tuple, Tuple[pd.DataFrame, pd.Series]] = {}
+        
+        # Tick buffers are only written from the event loop and read
+        # through TickBuffer.arrays(), so they need no lock
         self.ohlcv_lock = Lock()
         
+        # Bound concurrent get_ohlcv calls so they can't exhaust the thread pool
+        self.ohlcv_slots = asyncio.Semaphore(OHLCV_MAX_THREADS)
+        
         # Statistics
         self.tick_counts: Dict[str, int] = defaultdict(int)
-        self.last_tick_time: Dict[str, datetime] = {}
+        # Receive time of each symbol's latest tick, in ns since the epoch
+        self.last_tick_time: Dict[str, int] = {}
+        
+        # Symbols with buffered ticks, in first-tick order (dict as an
+        # ordered set), maintained by add_tick and clear_buffer
+        self._active_symbols: Dict[str, None] = {}
         
         log.info("Data Manager initialized (in-memory mode)")
     
@@ -55,15 +258,20 @@ class DataManager:
         Add a new tick to the buffer.
         
         Args:
-            tick: Dict with keys: symbol, price, qty, ts
+            tick: Dict with keys: symbol, price, qty, ts, and optionally
+                ts_ns (ts as epoch nanoseconds, used instead of parsing ts)
         """
         symbol = normalize_symbol(tick["symbol"])
+        ts_ns = tick.get("ts_ns")
+        if ts_ns is None:
+            ts_ns = iso_to_epoch_ns(tick["ts"])
         
         # Store in memory
-        with self.tick_locks[symbol]:
-            self.tick_buffers[symbol].append(tick)
-            self.tick_counts[symbol] += 1
-            self.last_tick_time[symbol] = datetime.now(timezone.utc)
+        self.tick_buffers[symbol].append(ts_ns, tick["price"], tick["qty"])
+        self.tick_counts[symbol] += 1
+        self.tick_versions[symbol] += 1
+        self.last_tick_time[symbol] = time.time_ns()
+        self._active_symbols[symbol] = None
         
         # Log every 1000 ticks
         if self.tick_counts[symbol] % 1000 == 0:
@@ -88,23 +296,52 @@ class DataManager:
         Returns:
             List of tick dictionaries
         """
+        return self._select_ticks(symbol, limit, from_ts, to_ts)
+    
+    def _select_ticks(
+        self,
+        symbol: str,
+        limit: Optional[int] = None,
+        from_ts: Optional[str] = None,
+        to_ts: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Snapshot and filter buffered ticks (see get_ticks)."""
         symbol = normalize_symbol(symbol)
+        ts, price, qty = self._tick_arrays(symbol, from_ts, to_ts, limit)
         
-        # Get from memory
-        with self.tick_locks[symbol]:
-            ticks = list(self.tick_buffers[symbol])
+        return [
+            {"symbol": symbol, "price": p, "qty": q, "ts": t}
+            for t, p, q in zip(epoch_ns_to_iso(ts), price.tolist(), qty.tolist())
+        ]
+    
+    def _tick_arrays(
+        self,
+        symbol: str,
+        from_ts: Optional[str] = None,
+        to_ts: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Snapshot a symbol's buffered (ts, price, qty) arrays, optionally time-filtered."""
+        buffer = self.tick_buffers.get(symbol, _EMPTY_TICKS)
+        if not (from_ts or to_ts):
+            # Only the newest ticks are wanted: copy just those
+            return buffer.arrays(limit or None)
+        
+        ts, price, qty = buffer.arrays()
         
         # Apply time filters
+        mask = np.ones(len(ts), dtype=bool)
         if from_ts:
-            ticks = [t for t in ticks if t["ts"] >= from_ts]
+            mask &= ts >= iso_to_epoch_ns(from_ts)
         if to_ts:
-            ticks = [t for t in ticks if t["ts"] <= to_ts]
+            mask &= ts <= iso_to_epoch_ns(to_ts)
+        ts, price, qty = ts[mask], price[mask], qty[mask]
         
         # Apply limit
         if limit:
-            ticks = ticks[-limit:]
+            ts, price, qty = ts[-limit:], price[-limit:], qty[-limit:]
         
-        return ticks
+        return ts, price, qty
     
     async def get_ohlcv(
         self,
@@ -124,33 +361,56 @@ class DataManager:
             limit: Maximum number of candles to return
             from_ts: ISO timestamp to filter from
             to_ts: ISO timestamp to filter to
-            force_resample: Force resampling even if cached
+            force_resample: Resample time-filtered ticks even if cached
             
         Returns:
             List of OHLCV dictionaries
         """
+        # Resampling and record conversion are CPU-bound pandas work; run
+        # them in a worker thread so WebSocket broadcasts keep flowing
+        async with self.ohlcv_slots:
+            return await asyncio.to_thread(
+                self.get_ohlcv_sync,
+                symbol,
+                timeframe,
+                limit,
+                from_ts,
+                to_ts,
+                force_resample,
+            )
+    
+    def get_ohlcv_sync(
+        self,
+        symbol: str,
+        timeframe: str = "1m",
+        limit: Optional[int] = None,
+        from_ts: Optional[str] = None,
+        to_ts: Optional[str] = None,
+        force_resample: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Blocking implementation of get_ohlcv."""
         symbol = normalize_symbol(symbol)
-        cache_key = (symbol, timeframe)
         
-        # Check memory cache
-        if not force_resample and cache_key in self.ohlcv_cache:
-            df = self.ohlcv_cache[cache_key]
-        else:
-            # Get ticks and resample
-            ticks = await self.get_ticks(symbol, from_ts=from_ts, to_ts=to_ts)
+        if force_resample and (from_ts or to_ts):
+            # Resample just the time-filtered ticks. The frame covers part
+            # of the buffer only, so it isn't cached under the buffer's key
+            ts, price, qty = self._tick_arrays(symbol, from_ts=from_ts, to_ts=to_ts)
             
-            if not ticks:
+            if not len(ts):
                 return []
             
             # Convert timeframe to pandas rule
             pandas_rule = timeframe_to_pandas_rule(timeframe)
-            df = resample_to_ohlcv(ticks, pandas_rule)
+            df = resample_arrays_to_ohlcv(ts, price, qty, pandas_rule)
+        else:
+            # Resampled on demand: the cached frame is reused while the
+            # tick buffer is unchanged and extended when ticks arrived
+            df = self._resample_buffer(symbol, timeframe)
             
-            # Cache the result in memory
-            with self.ohlcv_lock:
-                self.ohlcv_cache[cache_key] = df
+            if df is None:
+                return []
         
-        # Apply time filters to cached data
+        # Apply time filters
         if from_ts:
             df = df[df['ts'] >= from_ts]
         if to_ts:
@@ -169,10 +429,7 @@ class DataManager:
         """Get the most recent price for a symbol."""
         symbol = normalize_symbol(symbol)
         
-        with self.tick_locks[symbol]:
-            if not self.tick_buffers[symbol]:
-                return None
-            return self.tick_buffers[symbol][-1]["price"]
+        return self.tick_buffers.get(symbol, _EMPTY_TICKS).last_price()
     
     def get_statistics(self, symbol: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -186,32 +443,29 @@ class DataManager:
         """
         if symbol:
             symbol = normalize_symbol(symbol)
+            last_tick_ns = self.last_tick_time.get(symbol)
             return {
                 "symbol": symbol,
                 "tick_count": self.tick_counts.get(symbol, 0),
                 "buffer_size": len(self.tick_buffers.get(symbol, [])),
-                "last_tick": self.last_tick_time.get(symbol),
+                "last_tick": (
+                    datetime.fromtimestamp(last_tick_ns / 1e9, tz=timezone.utc)
+                    if last_tick_ns is not None else None
+                ),
                 "latest_price": self.get_latest_price(symbol),
             }
         else:
             return {
                 "symbols": list(self.tick_buffers.keys()),
                 "total_ticks": sum(self.tick_counts.values()),
-                "active_symbols": len([
-                    s for s in self.tick_buffers.keys()
-                    if len(self.tick_buffers[s]) > 0
-                ]),
+                "active_symbols": len(self._active_symbols),
                 "tick_counts": dict(self.tick_counts),
+                "ohlcv_cache": self.ohlcv_cache.stats(),
             }
 
     def get_active_symbols(self) -> List[str]:
         """Return symbols that currently have buffered ticks."""
-        active_symbols: List[str] = []
-        for symbol in list(self.tick_buffers.keys()):
-            with self.tick_locks[symbol]:
-                if self.tick_buffers[symbol]:
-                    active_symbols.append(symbol)
-        return active_symbols
+        return list(self._active_symbols)
     
     def clear_buffer(self, symbol: Optional[str] = None):
         """
@@ -222,9 +476,10 @@ class DataManager:
         """
         if symbol:
             symbol = normalize_symbol(symbol)
-            with self.tick_locks[symbol]:
-                self.tick_buffers[symbol].clear()
-                self.tick_counts[symbol] = 0
+            self.tick_buffers[symbol].clear()
+            self.tick_counts[symbol] = 0
+            self.tick_versions[symbol] += 1
+            self._active_symbols.pop(symbol, None)
             
             # Clear cached OHLCV for this symbol
             with self.ohlcv_lock:
@@ -233,17 +488,23 @@ class DataManager:
                 ]
                 for key in keys_to_remove:
                     del self.ohlcv_cache[key]
+                    self._forget_ohlcv(key)
             
             log.info(f"Cleared buffer for {symbol}")
         else:
             # Clear all buffers
             for sym in list(self.tick_buffers.keys()):
-                with self.tick_locks[sym]:
-                    self.tick_buffers[sym].clear()
-                    self.tick_counts[sym] = 0
+                self.tick_buffers[sym].clear()
+                self.tick_counts[sym] = 0
+                self.tick_versions[sym] += 1
+            self._active_symbols.clear()
             
             with self.ohlcv_lock:
                 self.ohlcv_cache.clear()
+                self.ohlcv_refreshed_at.clear()
+                self.ohlcv_versions.clear()
+                self.ohlcv_state.clear()
+                self.close_series.clear()
             
             log.info("Cleared all buffers")
     
@@ -261,6 +522,8 @@ class DataManager:
             symbol: Trading symbol
             timeframe: Timeframe for resampling
             limit: Maximum number of points
+            force_resample: Rebuild from ticks unless the cached frame was
+                built from the current tick buffer
             
         Returns:
             Pandas Series with timestamp index and price values
@@ -275,63 +538,120 @@ class DataManager:
                 df = self.ohlcv_cache.get(cache_key)
 
         if df is None:
-            # Pull current ticks snapshot
-            with self.tick_locks[symbol]:
-                ticks = list(self.tick_buffers[symbol])
-
-            if not ticks:
-                return pd.Series(dtype=float)
-
-            pandas_rule = timeframe_to_pandas_rule(timeframe)
-            df = resample_to_ohlcv(ticks, pandas_rule)
+            df = self._resample_buffer(symbol, timeframe)
 
-            if df.empty:
-                return pd.Series(dtype=float)
-
-            # Store fresh copy in cache for other consumers
-            with self.ohlcv_lock:
-                self.ohlcv_cache[cache_key] = df.copy()
+        if df is None or df.empty:
+            return pd.Series(dtype=float)
 
-        # Work on a copy to avoid mutating cached dataframe
-        df_local = df.copy()
+        # Build the timestamp-indexed series once per cached frame and hand
+        # out the same read-only object (or a tail view of it)
+        published = self.close_series.get(cache_key)
+        if published is not None and published[0] is df:
+            series = published[1]
+        else:
+            values = df['close'].to_numpy(dtype=np.float64, copy=True)
+            values.flags.writeable = False
+            series = pd.Series(
+                values,
+                index=pd.DatetimeIndex(pd.to_datetime(df['ts']), name='ts'),
+                name='close',
+                copy=False,
+            )
+            self.close_series[cache_key] = (df, series)
 
         if limit:
-            df_local = df_local.tail(limit)
-
-        if df_local.empty:
-            return pd.Series(dtype=float)
+            return series.tail(limit)
 
-        df_local['ts'] = pd.to_datetime(df_local['ts'])
-        df_local = df_local.set_index('ts')
-
-        return df_local['close']
+        return series
+    
+    def _forget_ohlcv(self, cache_key: tuple):
+        """Drop the bookkeeping kept alongside a cached frame (lock held)."""
+        self.ohlcv_refreshed_at.pop(cache_key, None)
+        self.ohlcv_versions.pop(cache_key, None)
+        self.ohlcv_state.pop(cache_key, None)
+        self.close_series.pop(cache_key, None)
     
-    async def resample_loop(self, interval: int = 60):
+    def _resample_buffer(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
         """
-        Background task to periodically resample and cache OHLCV data.
+        Resample a symbol's whole tick buffer, reusing the cached frame.
+        
+        The cached frame is returned as is when the buffer hasn't changed,
+        and extended incrementally when only new ticks arrived (see
+        _extend_ohlcv). The result is cached and must not be mutated.
         
         Args:
-            interval: Resample interval in seconds
+            symbol: Normalized trading symbol
+            timeframe: Timeframe for resampling
+            
+        Returns:
+            OHLCV DataFrame, or None when the buffer is empty
         """
-        while True:
-            try:
-                await asyncio.sleep(interval)
-                
-                # Resample all active symbols
-                for symbol in list(self.tick_buffers.keys()):
-                    for timeframe in settings.resample_intervals_list:
-                        try:
-                            await self.get_ohlcv(symbol, timeframe, force_resample=True)
-                        except Exception as e:
-                            log.error(f"Error resampling {symbol} @ {timeframe}: {e}")
-                
-                log.debug("Completed periodic resample")
-                
-            except asyncio.CancelledError:
-                log.info("Resample loop cancelled")
-                break
-            except Exception as e:
-                log.error(f"Error in resample loop: {e}")
+        cache_key = (symbol, timeframe)
+        
+        # Reading the version before the snapshot means a tick landing
+        # mid-snapshot only tags the frame as stale
+        version = self.tick_versions.get(symbol, 0)
+        
+        with self.ohlcv_lock:
+            cached = self.ohlcv_cache.get(cache_key)
+            if cached is not None and self.ohlcv_versions.get(cache_key) == version:
+                return cached
+            state = self.ohlcv_state.get(cache_key)
+        
+        buffer = self.tick_buffers.get(symbol, _EMPTY_TICKS)
+        ts, price, qty, appended, generation = buffer.snapshot()
+        
+        if not len(ts):
+            return None
+        
+        pandas_rule = timeframe_to_pandas_rule(timeframe)
+        period_ns = pandas_rule_to_ns(pandas_rule)
+        ordered = len(ts) < 2 or not (np.diff(ts) < 0).any()
+        
+        extended = None
+        if ordered and cached is not None and state is not None and state[0] == generation:
+            extended = _extend_ohlcv(
+                cached, state[2], ts, price, qty, appended - state[1], period_ns, pandas_rule
+            )
+        
+        if extended is not None:
+            df, starts = extended
+        else:
+            df = resample_arrays_to_ohlcv(ts, price, qty, pandas_rule)
+            starts = _bucket_starts(ts, period_ns) if ordered else None
+        
+        with self.ohlcv_lock:
+            self.ohlcv_cache[cache_key] = df
+            self.ohlcv_refreshed_at[cache_key] = time.monotonic()
+            self.ohlcv_versions[cache_key] = version
+            if starts is not None:
+                self.ohlcv_state[cache_key] = (generation, appended, starts)
+            else:
+                self.ohlcv_state.pop(cache_key, None)
+        
+        return df
+    
+    def refresh_ohlcv(self, symbol: str, timeframe: str = "1m", max_age: float = 0.0):
+        """
+        Resample ticks into the OHLCV cache unless it is already fresh.
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe for resampling
+            max_age: Skip resampling if the cached frame is younger than this (seconds)
+        """
+        cache_key = (normalize_symbol(symbol), timeframe)
+        
+        with self.ohlcv_lock:
+            refreshed_at = self.ohlcv_refreshed_at.get(cache_key)
+            if (
+                cache_key in self.ohlcv_cache
+                and refreshed_at is not None
+                and time.monotonic() - refreshed_at < max_age
+            ):
+                return
+        
+        self.get_price_series(symbol, timeframe, force_resample=True)
 
 
 # Global data manager instance
@@ -5,9 +5,16 @@ Provides persistent storage for tick data with resampling capabilities.
 Uses SQLite3 from Python standard library - no external dependencies needed.
 """
 
+import asyncio
+import queue
 import sqlite3
+import threading
+import time
 import pandas as pd
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, List, Tuple
 from contextlib import contextmanager
@@ -15,6 +22,46 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Streamed ticks are written in batches: every interval, or sooner once
+# this many are pending
+TICK_FLUSH_INTERVAL = 0.5
+TICK_FLUSH_ROWS = 1000
+# Queued ticks kept while writes fail; the oldest are dropped beyond this
+TICK_QUEUE_MAX = 100_000
+
+
+def _new_tick_columns() -> Tuple[deque, deque, deque, deque]:
+    """Empty (symbol, price, volume, ts_ms) columns for queued ticks."""
+    return tuple(deque(maxlen=TICK_QUEUE_MAX) for _ in range(4))
+
+TICK_INSERT_SQL = "INSERT INTO ticks (symbol, price, volume, timestamp) VALUES (?, ?, ?, ?)"
+# Queued ticks carry epoch milliseconds; SQLite formats them in the same
+# text layout the datetime adapter writes, so no datetime is built per tick
+TICK_QUEUE_INSERT_SQL = (
+    "INSERT INTO ticks (symbol, price, volume, timestamp) VALUES "
+    "(?, ?, ?, strftime('%Y-%m-%d %H:%M:%f000', ? / 1000.0, 'unixepoch'))"
+)
+
+
+@lru_cache(maxsize=64)
+def _timeframe_to_seconds(timeframe: str) -> Optional[int]:
+    """
+    Convert a pandas frequency string to a bucket size in seconds.
+    
+    Returns None when the rule can't be expressed as epoch-aligned
+    buckets matching pandas resampling (sub-second, calendar-based, or
+    not evenly dividing a day).
+    """
+    try:
+        seconds = pd.Timedelta(pd.tseries.frequencies.to_offset(timeframe)).total_seconds()
+    except (ValueError, TypeError):
+        return None
+    
+    if seconds < 1 or seconds != int(seconds) or 86400 % int(seconds) != 0:
+        return None
+    
+    return int(seconds)
+
 
 class MarketDatabase:
     """
@@ -27,35 +74,114 @@ class MarketDatabase:
     - Data retention management
     """
     
-    def __init__(self, db_path: str = "market_data.db"):
+    def __init__(
+        self,
+        db_path: str = "market_data.db",
+        read_pool_size: int = 4,
+        write_pool_size: int = 2
+    ):
         """
         Initialize database connection.
         
         Args:
             db_path: Path to SQLite database file
+            read_pool_size: Number of idle read connections kept open
+            write_pool_size: Number of idle write connections kept open
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._vacuum_lock = threading.Lock()
+        self._read_pool: queue.Queue = queue.Queue(maxsize=read_pool_size)
+        self._write_pool: queue.Queue = queue.Queue(maxsize=write_pool_size)
+        # Queued ticks as parallel columns rather than a tuple per tick;
+        # rows are zipped back together only while inserting
+        self._pending = _new_tick_columns()
+        self._pending_lock = threading.Lock()
         logger.info(f"Database initialized at: {self.db_path}")
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a connection configured for concurrent reads and writes.
+        
+        WAL lets readers proceed while tick ingestion writes; NORMAL
+        synchronous is durable in WAL mode except on power loss. The page
+        size and incremental auto-vacuum only take effect when the file is
+        created, so they are issued before the journal mode (which writes
+        the header); existing databases switch auto-vacuum over on their
+        next full VACUUM.
+        """
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA page_size=8192")
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-65536")
+        return conn
         
     @contextmanager
     def get_connection(self):
         """
-        Context manager for database connections.
+        Context manager for write transactions using pooled connections.
         
-        Ensures proper connection cleanup and auto-commit.
+        Commits on success and rolls back on error. Connections (and the
+        statements sqlite3 caches on them) are reused across calls, like
+        read_connection.
         """
-        conn = sqlite3.connect(self.db_path)
+        try:
+            conn = self._write_pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        
         try:
             yield conn
             conn.commit()
         except Exception as e:
             conn.rollback()
+            conn.close()
             logger.error(f"Database transaction failed: {e}")
             raise
-        finally:
+        
+        try:
+            self._write_pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+    
+    @contextmanager
+    def read_connection(self):
+        """
+        Context manager for read-only queries using pooled connections.
+        
+        Connections are reused across calls; a new one is opened when the
+        pool is empty and extras are closed when the pool is full.
+        """
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        
+        try:
+            yield conn
+        except Exception:
+            conn.close()
+            raise
+        
+        try:
+            self._read_pool.put_nowait(conn)
+        except queue.Full:
             conn.close()
     
+    def close(self) -> None:
+        """Write any queued ticks and close all pooled connections."""
+        self.flush_pending()
+        for pool in (self._read_pool, self._write_pool):
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+    
     def init_db(self) -> None:
         """
         Initialize database schema.
@@ -77,11 +203,14 @@ class MarketDatabase:
                 )
             """)
             
-            # Create indexes for fast queries
+            # Create indexes for fast queries. The (symbol, timestamp) index
+            # also carries price and volume so range reads never touch the
+            # table; it supersedes the older two-column index
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_symbol_timestamp 
-                ON ticks(symbol, timestamp)
+                CREATE INDEX IF NOT EXISTS idx_symbol_timestamp_covering 
+                ON ticks(symbol, timestamp, price, volume)
             """)
+            cursor.execute("DROP INDEX IF EXISTS idx_symbol_timestamp")
             
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_timestamp 
@@ -140,15 +269,74 @@ class MarketDatabase:
         
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.executemany(
-                "INSERT INTO ticks (symbol, price, volume, timestamp) VALUES (?, ?, ?, ?)",
-                ticks
-            )
+            cursor.executemany(TICK_INSERT_SQL, ticks)
             count = cursor.rowcount
             
         logger.info(f"Batch inserted {count} ticks")
         return count
     
+    def queue_tick(
+        self,
+        symbol: str,
+        price: float,
+        volume: float,
+        ts_ms: Optional[int] = None
+    ) -> int:
+        """
+        Queue a tick to be written by the next flush_pending() call.
+        
+        At most TICK_QUEUE_MAX ticks are kept; beyond that the oldest
+        queued tick is dropped.
+        
+        Args:
+            symbol: Trading symbol (e.g., 'BTCUSDT')
+            price: Trade price
+            volume: Trade volume
+            ts_ms: Trade time in UTC epoch milliseconds (defaults to now)
+            
+        Returns:
+            Number of ticks now pending
+        """
+        if ts_ms is None:
+            ts_ms = time.time_ns() // 1_000_000
+        
+        with self._pending_lock:
+            symbols, prices, volumes, timestamps = self._pending
+            symbols.append(symbol)
+            prices.append(price)
+            volumes.append(volume)
+            timestamps.append(ts_ms)
+            return len(symbols)
+    
+    def flush_pending(self) -> int:
+        """
+        Write all queued ticks in a single transaction.
+        
+        Returns:
+            Number of rows inserted
+        """
+        with self._pending_lock:
+            columns, self._pending = self._pending, _new_tick_columns()
+        
+        count = len(columns[0])
+        if not count:
+            return 0
+        
+        try:
+            with self.get_connection() as conn:
+                conn.executemany(TICK_QUEUE_INSERT_SQL, zip(*columns))
+        except Exception:
+            # Put the batch back ahead of ticks queued meanwhile, so a
+            # failed write (e.g. a locked database) is retried next flush
+            with self._pending_lock:
+                for column, queued in zip(columns, self._pending):
+                    column.extend(queued)
+                self._pending = columns
+            raise
+        
+        logger.debug(f"Flushed {count} queued ticks")
+        return count
+    
     def get_ticks(
         self,
         symbol: str,
@@ -182,13 +370,14 @@ class MarketDatabase:
         query += " ORDER BY timestamp ASC"
         
         if limit:
-            query += f" LIMIT {limit}"
+            query += " LIMIT ?"
+            params.append(limit)
         
-        with self.get_connection() as conn:
+        with self.read_connection() as conn:
             df = pd.read_sql_query(query, conn, params=params)
         
         if not df.empty:
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601')
             logger.info(f"Fetched {len(df)} ticks for {symbol}")
         else:
             logger.warning(f"No ticks found for {symbol}")
@@ -223,6 +412,77 @@ class MarketDatabase:
         Returns:
             DataFrame with OHLCV columns and timestamp index
         """
+        bucket_seconds = _timeframe_to_seconds(timeframe)
+        
+        if bucket_seconds is None:
+            return self._resample_with_pandas(symbol, timeframe, start_time, end_time)
+        
+        # Aggregate in SQL so only one row per candle leaves SQLite
+        where = "symbol = ?"
+        params: List = [bucket_seconds, bucket_seconds, symbol]
+        
+        if start_time:
+            where += " AND timestamp >= ?"
+            params.append(start_time)
+        
+        if end_time:
+            where += " AND timestamp <= ?"
+            params.append(end_time)
+        
+        query = f"""
+            SELECT bucket AS ts, open, high, low, close, volume
+            FROM (
+                SELECT
+                    bucket,
+                    FIRST_VALUE(price) OVER candle AS open,
+                    MAX(price) OVER candle AS high,
+                    MIN(price) OVER candle AS low,
+                    LAST_VALUE(price) OVER candle AS close,
+                    SUM(volume) OVER candle AS volume,
+                    ROW_NUMBER() OVER candle AS rn
+                FROM (
+                    SELECT
+                        CAST(strftime('%s', timestamp) AS INTEGER) / ? * ? AS bucket,
+                        timestamp, id, price, volume
+                    FROM ticks
+                    WHERE {where}
+                )
+                WINDOW candle AS (
+                    PARTITION BY bucket ORDER BY timestamp, id
+                    ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+                )
+            )
+            WHERE rn = 1
+            ORDER BY bucket
+        """
+        
+        # Build the frame straight from the cursor rows; the column types
+        # are known, so read_sql_query's inference isn't needed
+        with self.read_connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+        
+        result = pd.DataFrame.from_records(
+            rows, columns=['ts', 'open', 'high', 'low', 'close', 'volume']
+        )
+        
+        if result.empty:
+            logger.warning(f"No data available for resampling {symbol} at {timeframe}")
+            return pd.DataFrame(columns=['open', 'high', 'low', 'close', 'volume'])
+        
+        result['ts'] = pd.to_datetime(result['ts'], unit='s')
+        
+        logger.info(f"Resampled {symbol} to {timeframe}: {len(result)} candles")
+        
+        return result
+    
+    def _resample_with_pandas(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """Resample in pandas for rules that don't evenly divide a day."""
         # Fetch raw tick data
         df = self.get_ticks(symbol, start_time, end_time)
         
@@ -233,13 +493,14 @@ class MarketDatabase:
         # Set timestamp as index for resampling
         df.set_index('timestamp', inplace=True)
         
-        # Resample to OHLCV
-        ohlcv = df['price'].resample(timeframe).ohlc()  # open, high, low, close
-        volume = df['volume'].resample(timeframe).sum()  # total volume
-        
-        # Combine into single DataFrame
-        result = ohlcv.copy()
-        result['volume'] = volume
+        # Resample to OHLCV, sharing one set of bins across all columns
+        result = df.resample(timeframe).agg(
+            open=('price', 'first'),
+            high=('price', 'max'),
+            low=('price', 'min'),
+            close=('price', 'last'),
+            volume=('volume', 'sum'),
+        )
         
         # Drop rows with no data (NaN)
         result.dropna(subset=['open'], inplace=True)
@@ -273,6 +534,10 @@ class MarketDatabase:
             deleted_count = cursor.rowcount
         
         logger.info(f"Deleted {deleted_count} ticks older than {hours} hours")
+        
+        if deleted_count > 0:
+            self.incremental_vacuum()
+        
         return deleted_count
     
     def get_database_stats(self) -> dict:
@@ -282,7 +547,7 @@ class MarketDatabase:
         Returns:
             Dictionary with database metrics
         """
-        with self.get_connection() as conn:
+        with self.read_connection() as conn:
             cursor = conn.cursor()
             
             # Total tick count
@@ -362,13 +627,37 @@ class MarketDatabase:
         """
         Optimize database by reclaiming unused space.
         
-        Should be called periodically after large deletions.
+        Rewrites the whole database file, so concurrent requests are
+        coalesced: if a vacuum is already running, this call returns
+        immediately.
         """
-        with self.get_connection() as conn:
-            conn.execute("VACUUM")
+        if not self._vacuum_lock.acquire(blocking=False):
+            logger.info("Database vacuum already in progress, skipping")
+            return
+        
+        try:
+            with self.get_connection() as conn:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+        finally:
+            self._vacuum_lock.release()
         
         logger.info("Database vacuum completed")
     
+    def incremental_vacuum(self, pages: int = 1000) -> None:
+        """
+        Reclaim up to ``pages`` free pages without rewriting the file.
+        
+        Only effective when the database uses incremental auto-vacuum.
+        
+        Args:
+            pages: Maximum number of free pages to release
+        """
+        with self.get_connection() as conn:
+            # executescript steps the pragma to completion (execute frees one page)
+            conn.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+    
     def clear_all_data(self) -> None:
         """
         Delete all tick data from database.
@@ -430,6 +719,26 @@ def insert_ticks_batch(ticks: List[Tuple[str, float, float, datetime]]) -> int:
     return db.insert_ticks_batch(ticks)
 
 
+# Set when enough ticks are queued to flush before the next interval
+_tick_flush_wanted = asyncio.Event()
+
+# Flushes run on their own thread so they neither queue behind
+# resampling work in the default pool nor overlap each other
+_tick_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tick-db")
+
+
+def queue_tick(
+    symbol: str, 
+    price: float, 
+    volume: float, 
+    ts_ms: Optional[int] = None
+) -> None:
+    """Queue a tick for the background flusher (see tick_flush_loop)."""
+    db = get_db()
+    if db.queue_tick(symbol, price, volume, ts_ms) >= TICK_FLUSH_ROWS:
+        _tick_flush_wanted.set()
+
+
 def get_ticks(
     symbol: str,
     start_time: Optional[datetime] = None,
@@ -476,6 +785,47 @@ def get_database_stats() -> dict:
     return db.get_database_stats()
 
 
+async def tick_flush_loop(interval: float = TICK_FLUSH_INTERVAL):
+    """
+    Background task writing queued ticks in batches.
+    
+    Args:
+        interval: Maximum seconds between flushes
+    """
+    while True:
+        try:
+            try:
+                await asyncio.wait_for(_tick_flush_wanted.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            _tick_flush_wanted.clear()
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(_tick_writer, get_db().flush_pending)
+        except asyncio.CancelledError:
+            logger.info("Tick flush loop cancelled")
+            break
+        except Exception as e:
+            logger.error(f"Error in tick flush loop: {e}")
+
+
+async def vacuum_loop(interval: int = 86400):
+    """
+    Background task to periodically run a full VACUUM.
+    
+    Args:
+        interval: Vacuum interval in seconds (default: daily)
+    """
+    while True:
+        try:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(get_db().vacuum)
+        except asyncio.CancelledError:
+            logger.info("Vacuum loop cancelled")
+            break
+        except Exception as e:
+            logger.error(f"Error in vacuum loop: {e}")
+
+
 if __name__ == "__main__":
     # Example usage and testing
     logging.basicConfig(level=logging.INFO)
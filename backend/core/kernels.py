@@ -0,0 +1,165 @@
+"""
+Numba-compiled rolling-window kernels for the analytics engine.
+Signatures are declared up front so compilation happens at import time,
+and compiled code is cached on disk to avoid recompiling on restart.
+"""
+import numpy as np
+from numba import njit
+
+
+@njit("float64[:](float64[:], float64[:], int64)", cache=True)
+def rolling_ols_beta(y, x, window):
+    """
+    Rolling OLS slope of y on x (with intercept).
+
+    Args:
+        y: Dependent variable values
+        x: Independent variable values
+        window: Rolling window size
+
+    Returns:
+        Array of slopes, NaN until the first full window
+    """
+    n = len(y)
+    out = np.full(n, np.nan)
+
+    for end in range(window, n + 1):
+        start = end - window
+
+        x_mean = 0.0
+        y_mean = 0.0
+        for j in range(start, end):
+            x_mean += x[j]
+            y_mean += y[j]
+        x_mean /= window
+        y_mean /= window
+
+        sxx = 0.0
+        sxy = 0.0
+        for j in range(start, end):
+            dx = x[j] - x_mean
+            sxx += dx * dx
+            sxy += dx * (y[j] - y_mean)
+
+        if sxx > 0.0:
+            out[end - 1] = sxy / sxx
+        else:
+            # Constant x: minimum-norm least-squares solution (as pinv)
+            out[end - 1] = x_mean * y_mean / (1.0 + x_mean * x_mean)
+
+    return out
+
+
+@njit("Tuple((float64[:], float64[:]))(float64[:], int64)", cache=True)
+def rolling_mean_std(values, window):
+    """
+    Rolling mean and sample standard deviation using Welford updates.
+
+    Args:
+        values: Input values
+        window: Rolling window size
+
+    Returns:
+        Tuple of (mean, std) arrays, NaN until the first full window
+    """
+    n = len(values)
+    means = np.full(n, np.nan)
+    stds = np.full(n, np.nan)
+
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+
+    for i in range(n):
+        # Add the incoming value
+        count += 1
+        delta = values[i] - mean
+        mean += delta / count
+        m2 += delta * (values[i] - mean)
+
+        # Drop the value leaving the window
+        if count > window:
+            old = values[i - window]
+            count -= 1
+            delta = old - mean
+            mean -= delta / count
+            m2 -= delta * (old - mean)
+
+        if count == window:
+            means[i] = mean
+            if window > 1:
+                stds[i] = np.sqrt(max(m2, 0.0) / (window - 1))
+
+    return means, stds
+
+
+@njit("float64[:](float64[:], int64)", cache=True)
+def rolling_zscore(values, window):
+    """
+    Rolling z-score of each value against its trailing window.
+
+    Args:
+        values: Input values
+        window: Rolling window size
+
+    Returns:
+        Array of z-scores (0.0 where std is zero), NaN until the first full window
+    """
+    means, stds = rolling_mean_std(values, window)
+    n = len(values)
+    out = np.full(n, np.nan)
+
+    for i in range(window - 1, n):
+        std = stds[i]
+        if np.isnan(std) or np.isnan(means[i]):
+            continue
+        if std == 0.0:
+            out[i] = 0.0
+        else:
+            out[i] = (values[i] - means[i]) / std
+
+    return out
+
+
+@njit("float64[:](float64[:], float64[:], int64)", cache=True)
+def rolling_corr(a, b, window):
+    """
+    Rolling Pearson correlation between two series.
+
+    Args:
+        a: First series values
+        b: Second series values
+        window: Rolling window size
+
+    Returns:
+        Array of correlations, NaN until the first full window or when
+        either series is constant within the window
+    """
+    n = len(a)
+    out = np.full(n, np.nan)
+
+    for end in range(window, n + 1):
+        start = end - window
+
+        a_mean = 0.0
+        b_mean = 0.0
+        for j in range(start, end):
+            a_mean += a[j]
+            b_mean += b[j]
+        a_mean /= window
+        b_mean /= window
+
+        saa = 0.0
+        sbb = 0.0
+        sab = 0.0
+        for j in range(start, end):
+            da = a[j] - a_mean
+            db = b[j] - b_mean
+            saa += da * da
+            sbb += db * db
+            sab += da * db
+
+        if saa > 0.0 and sbb > 0.0:
+            out[end - 1] = sab / np.sqrt(saa * sbb)
+
+    return out
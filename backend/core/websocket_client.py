@@ -3,16 +3,60 @@ Binance Futures WebSocket client for real-time tick data and 24h ticker stats.
 Connects to:
 - wss://fstream.binance.com/ws/{symbol}@trade (trade stream)
 - wss://fstream.binance.com/ws/{symbol}@ticker (24h ticker stream)
+
+WebSocketManager carries every subscribed symbol's streams over a single
+combined-stream connection (MultiplexedBinanceClient).
 """
 import asyncio
-import json
-from datetime import datetime, timezone
-from typing import Callable, Dict, Optional
+import itertools
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Set, Union
+import msgspec
 import websockets
 from websockets.exceptions import ConnectionClosed, WebSocketException
 
 from utils import log, normalize_symbol, settings
-from core.db import insert_tick
+from core.db import queue_tick
+
+# Epoch for formatting trade times as naive UTC datetimes
+_EPOCH = datetime(1970, 1, 1)
+
+# Reconnect backoff in seconds, indexed by consecutive failed attempts
+RECONNECT_DELAYS = (1, 2, 4, 8, 16, 32, 60)
+
+
+class TradeEvent(msgspec.Struct, tag_field="e", tag="trade", gc=False):
+    """Fields of a Binance trade event used by the client."""
+    s: str    # Symbol
+    p: float  # Price
+    q: float  # Quantity
+    T: int    # Trade time (ms)
+
+
+class TickerEvent(msgspec.Struct, tag_field="e", tag="24hrTicker", gc=False):
+    """Fields of a Binance 24h ticker event used by the client."""
+    E: int    # Event time (ms)
+    s: str    # Symbol
+    p: float  # Price change
+    P: float  # Price change percent
+    c: float  # Last price
+    o: float  # Open price (24h ago)
+    h: float  # High price (24h)
+    l: float  # Low price (24h)
+    v: float  # Total traded base asset volume (24h)
+    q: float  # Total traded quote asset volume (24h)
+
+
+class StreamMessage(msgspec.Struct, gc=False):
+    """Binance combined stream wrapper."""
+    stream: str
+    data: Union[TradeEvent, TickerEvent]
+
+
+# Messages are decoded straight into the structs above; strict=False lets
+# the numeric strings Binance sends convert to floats during the parse
+_stream_decoder = msgspec.json.Decoder(StreamMessage, strict=False)
+_event_decoder = msgspec.json.Decoder(Union[TradeEvent, TickerEvent], strict=False)
 
 
 class BinanceWebSocketClient:
@@ -37,13 +81,30 @@ class BinanceWebSocketClient:
         
         # Combined stream URL for both trade and 24h ticker
         symbol_lower = self.symbol.lower()
-        self.ws_url = f"{settings.binance_ws_base}/stream?streams={symbol_lower}@trade/{symbol_lower}@ticker"
+        trade_stream = f"{symbol_lower}@trade"
+        ticker_stream = f"{symbol_lower}@ticker"
+        self.ws_url = f"{settings.binance_ws_base}/stream?streams={trade_stream}/{ticker_stream}"
+        
+        # Message handlers by combined stream name, and by event type for
+        # unwrapped messages
+        self._stream_handlers: Dict[str, Callable] = {
+            trade_stream: self._handle_trade,
+            ticker_stream: self._handle_ticker,
+        }
+        self._event_handlers: Dict[type, Callable] = {
+            TradeEvent: self._handle_trade,
+            TickerEvent: self._handle_ticker,
+        }
         
         self.websocket: Optional[websockets.WebSocketClientProtocol] = None
         self.task: Optional[asyncio.Task] = None
         self.is_running = False
-        self.reconnect_delay = 1  # seconds
-        self.max_reconnect_delay = 60  # seconds
+        self.reconnect_attempts = 0
+        
+        # ISO prefix of the last trade's second, reused by the trades
+        # that follow within it (see _trade_time_iso)
+        self._iso_second: Optional[int] = None
+        self._iso_prefix = ""
         
     async def connect(self):
         """Establish WebSocket connection and start listening."""
@@ -61,11 +122,15 @@ class BinanceWebSocketClient:
                     ping_interval=20,
                     ping_timeout=10,
                     close_timeout=10,
-                    max_size=10 * 1024 * 1024,  # 10MB max message size
+                    max_size=2 ** 20,  # 1MB max message size; events are < 1KB
+                    max_queue=64,
+                    # Events are small JSON: per-message deflate costs a zlib
+                    # inflate per tick for next to no bandwidth saving
+                    compression=None,
                 ) as websocket:
                     self.websocket = websocket
                     log.info(f"✅ WebSocket connected: {self.symbol}")
-                    self.reconnect_delay = 1  # Reset delay on successful connection
+                    self.reconnect_attempts = 0  # Reset backoff on successful connection
                     
                     # Listen for messages
                     async for message in websocket:
@@ -73,12 +138,13 @@ class BinanceWebSocketClient:
                             break
                             
                         try:
-                            data = json.loads(message)
-                            await self._handle_message(data)
-                        except json.JSONDecodeError as e:
-                            log.error(f"JSON decode error for {self.symbol}: {e} - Message: {message[:100]}")
+                            handling = self._route_message(message)
+                            if handling is not None:
+                                await handling
+                        except msgspec.DecodeError as e:
+                            log.error("Message decode error for {}: {} - Message: {}", self.symbol, e, message[:100])
                         except Exception as e:
-                            log.error(f"Error processing message for {self.symbol}: {type(e).__name__} - {str(e)}")
+                            log.error("Error processing message for {}: {} - {}", self.symbol, type(e).__name__, e)
                             
             except ConnectionClosed as e:
                 if self.is_running:
@@ -95,16 +161,20 @@ class BinanceWebSocketClient:
             
             # Reconnection logic with exponential backoff
             if self.is_running:
-                log.info(f"Reconnecting {self.symbol} in {self.reconnect_delay}s...")
-                await asyncio.sleep(self.reconnect_delay)
-                self.reconnect_delay = min(
-                    self.reconnect_delay * 2,
-                    self.max_reconnect_delay
-                )
+                delay = RECONNECT_DELAYS[min(self.reconnect_attempts, len(RECONNECT_DELAYS) - 1)]
+                self.reconnect_attempts += 1
+                log.info("Reconnecting {} in {}s...", self.symbol, delay)
+                await asyncio.sleep(delay)
     
-    async def _handle_message(self, data: Dict):
+    def _route_message(self, message: Union[str, bytes]) -> Optional[Awaitable]:
         """
-        Parse and handle incoming trade or ticker message.
+        Parse an incoming trade or ticker message and start its handler.
+        
+        Messages are decoded into TradeEvent/TickerEvent, keeping only the
+        fields below; a message of any other shape raises
+        msgspec.DecodeError. Returns the handler's coroutine for the caller
+        to await (None for other symbols' streams), so each message costs
+        one coroutine rather than two.
         
         Binance combined stream format wraps messages:
         {
@@ -141,60 +211,71 @@ class BinanceWebSocketClient:
         }
         """
         # Handle combined stream format
-        if "stream" in data and "data" in data:
-            inner_data = data["data"]
-            stream_name = data["stream"]
-            
-            if "@trade" in stream_name and inner_data.get("e") == "trade":
-                await self._handle_trade(inner_data)
-            elif "@ticker" in stream_name and inner_data.get("e") == "24hrTicker":
-                await self._handle_ticker(inner_data)
-        else:
+        try:
+            wrapped = _stream_decoder.decode(message)
+        except msgspec.ValidationError as error:
             # Fallback for non-combined stream format
-            if data.get("e") == "trade":
-                await self._handle_trade(data)
-            elif data.get("e") == "24hrTicker":
-                await self._handle_ticker(data)
+            try:
+                event = _event_decoder.decode(message)
+            except msgspec.ValidationError:
+                raise error from None
+            return self._event_handlers[type(event)](event)
+        
+        handler = self._stream_handlers.get(wrapped.stream)
+        if handler is None:
+            return None
+        return handler(wrapped.data)
+    
+    def _trade_time_iso(self, trade_ms: int) -> str:
+        """
+        Format a trade time as datetime.isoformat() would, with a UTC offset.
+        
+        Trades arrive many to a second, so the date and time up to the
+        second are formatted once per second and only the milliseconds
+        are formatted per trade.
+        """
+        second, millis = divmod(trade_ms, 1000)
+        if second != self._iso_second:
+            self._iso_second = second
+            self._iso_prefix = (_EPOCH + timedelta(seconds=second)).isoformat()
+        if millis:
+            return f"{self._iso_prefix}.{millis:03d}000+00:00"
+        return self._iso_prefix + "+00:00"
     
-    async def _handle_trade(self, data: Dict):
+    async def _handle_trade(self, trade: TradeEvent):
         """Handle trade event."""
         try:
-            # Extract timestamp
-            trade_timestamp = datetime.fromtimestamp(
-                data["T"] / 1000,  # Convert ms to seconds
-                tz=timezone.utc
-            )
+            # Extract timestamp (trade time in ms since the epoch)
+            trade_ms = trade.T
             
-            # Extract and normalize tick data
+            # Extract and normalize tick data; ts_ns spares the data
+            # manager from parsing the ISO string back
             tick = {
-                "symbol": data["s"],
-                "price": float(data["p"]),
-                "qty": float(data["q"]),
-                "ts": trade_timestamp.isoformat(),
+                "symbol": trade.s,
+                "price": trade.p,
+                "qty": trade.q,
+                "ts": self._trade_time_iso(trade_ms),
+                "ts_ns": trade_ms * 1_000_000,
             }
             
-            # Store in database (async to avoid blocking)
+            # Queue for the batched database writer
             try:
-                insert_tick(
+                queue_tick(
                     symbol=tick["symbol"],
                     price=tick["price"],
                     volume=tick["qty"],
-                    timestamp=trade_timestamp.replace(tzinfo=None)  # SQLite uses naive datetime
+                    ts_ms=trade_ms
                 )
             except Exception as db_error:
-                log.error(f"Database insert failed for {self.symbol}: {db_error}")
+                log.error("Database insert failed for {}: {}", self.symbol, db_error)
             
             # Call the tick handler
             await self.on_tick(tick)
             
-        except KeyError as e:
-            log.error(f"Missing field in trade message for {self.symbol}: {e}")
-        except ValueError as e:
-            log.error(f"Invalid value in trade message for {self.symbol}: {e}")
         except Exception as e:
-            log.error(f"Error handling trade message for {self.symbol}: {e}")
+            log.error("Error handling trade message for {}: {}", self.symbol, e)
     
-    async def _handle_ticker(self, data: Dict):
+    async def _handle_ticker(self, ticker_event: TickerEvent):
         """Handle 24h ticker event."""
         if not self.on_ticker:
             return
@@ -202,17 +283,17 @@ class BinanceWebSocketClient:
         try:
             # Extract 24h ticker stats
             ticker = {
-                "symbol": data["s"],
-                "priceChange": float(data["p"]),
-                "priceChangePercent": float(data["P"]),
-                "lastPrice": float(data["c"]),
-                "openPrice": float(data["o"]),
-                "highPrice": float(data["h"]),
-                "lowPrice": float(data["l"]),
-                "volume": float(data["v"]),
-                "quoteVolume": float(data["q"]),
+                "symbol": ticker_event.s,
+                "priceChange": ticker_event.p,
+                "priceChangePercent": ticker_event.P,
+                "lastPrice": ticker_event.c,
+                "openPrice": ticker_event.o,
+                "highPrice": ticker_event.h,
+                "lowPrice": ticker_event.l,
+                "volume": ticker_event.v,
+                "quoteVolume": ticker_event.q,
                 "ts": datetime.fromtimestamp(
-                    data["E"] / 1000,
+                    ticker_event.E / 1000,
                     tz=timezone.utc
                 ).isoformat(),
             }
@@ -220,12 +301,8 @@ class BinanceWebSocketClient:
             # Call the ticker handler
             await self.on_ticker(ticker)
             
-        except KeyError as e:
-            log.error(f"Missing field in ticker message for {self.symbol}: {e}")
-        except ValueError as e:
-            log.error(f"Invalid value in ticker message for {self.symbol}: {e}")
         except Exception as e:
-            log.error(f"Error handling ticker message for {self.symbol}: {e}")
+            log.error("Error handling ticker message for {}: {}", self.symbol, e)
     
     async def disconnect(self):
         """Stop the WebSocket connection gracefully."""
@@ -244,10 +321,195 @@ class BinanceWebSocketClient:
         log.info(f"Disconnected WebSocket for {self.symbol}")
 
 
+class MultiplexedBinanceClient:
+    """
+    One Binance combined-stream connection shared by many symbols.
+    
+    Symbols are added and removed on the live connection with SUBSCRIBE /
+    UNSUBSCRIBE requests, and each reconnect builds its URL from the
+    current set. Events are routed by stream name to the symbol's
+    BinanceWebSocketClient, which still parses and handles them; those
+    clients are never connected themselves.
+    """
+    
+    def __init__(self):
+        """Initialize with no symbols; the connection opens on the first add()."""
+        self.clients: Dict[str, BinanceWebSocketClient] = {}
+        
+        # Stream name -> event handler, across all clients
+        self._stream_handlers: Dict[str, Callable] = {}
+        # Streams the open connection is subscribed to
+        self._live_streams: Set[str] = set()
+        self._request_ids = itertools.count(1)
+        
+        self.websocket: Optional[websockets.WebSocketClientProtocol] = None
+        self.task: Optional[asyncio.Task] = None
+        self.is_running = False
+        self.reconnect_attempts = 0
+    
+    async def add(self, clients: Iterable[BinanceWebSocketClient]):
+        """
+        Start streaming for symbol clients, connecting if needed.
+        
+        Args:
+            clients: Unconnected clients, one per symbol
+        """
+        for client in clients:
+            self.clients[client.symbol] = client
+            self._stream_handlers.update(client._stream_handlers)
+        
+        if not self.clients:
+            # Nothing to stream: don't open an empty combined stream
+            return
+        
+        if not self.is_running:
+            self.is_running = True
+            self.task = asyncio.create_task(self._listen())
+            log.info("Started multiplexed Binance WebSocket stream")
+        else:
+            await self._sync_streams()
+    
+    async def remove(self, symbols: Iterable[str]):
+        """
+        Stop streaming for symbols, disconnecting once none are left.
+        
+        Args:
+            symbols: Normalized trading symbols
+        """
+        for symbol in symbols:
+            client = self.clients.pop(symbol, None)
+            if client is not None:
+                for stream in client._stream_handlers:
+                    self._stream_handlers.pop(stream, None)
+        
+        if not self.clients:
+            await self.disconnect()
+        else:
+            await self._sync_streams()
+    
+    async def _sync_streams(self):
+        """Subscribe/unsubscribe the open connection to match the clients."""
+        websocket = self.websocket
+        if websocket is None or websocket.closed:
+            return  # The next connection's URL lists the current streams
+        
+        wanted = set(self._stream_handlers)
+        added = sorted(wanted - self._live_streams)
+        removed = sorted(self._live_streams - wanted)
+        self._live_streams = wanted
+        
+        for method, params in (("SUBSCRIBE", added), ("UNSUBSCRIBE", removed)):
+            if params:
+                request = {"method": method, "params": params, "id": next(self._request_ids)}
+                await websocket.send(msgspec.json.encode(request).decode())
+                log.info("Sent {} for {}", method, params)
+    
+    async def _listen(self):
+        """Main loop for the shared connection with automatic reconnection."""
+        while self.is_running:
+            try:
+                streams = list(self._stream_handlers)
+                url = f"{settings.binance_ws_base}/stream?streams={'/'.join(streams)}"
+                log.info(f"Connecting to Binance WebSocket for {len(self.clients)} symbols...")
+                async with websockets.connect(
+                    url,
+                    ping_interval=20,
+                    ping_timeout=10,
+                    close_timeout=10,
+                    max_size=2 ** 20,  # 1MB max message size; events are < 1KB
+                    max_queue=64,
+                    # Events are small JSON: per-message deflate costs a zlib
+                    # inflate per tick for next to no bandwidth saving
+                    compression=None,
+                ) as websocket:
+                    self.websocket = websocket
+                    self._live_streams = set(streams)
+                    log.info(f"✅ WebSocket connected: {', '.join(self.clients)}")
+                    self.reconnect_attempts = 0  # Reset backoff on successful connection
+                    
+                    # Catch up with symbols added or removed while connecting
+                    await self._sync_streams()
+                    
+                    # Listen for messages
+                    async for message in websocket:
+                        if not self.is_running:
+                            break
+                        
+                        try:
+                            handling = self._route_message(message)
+                            if handling is not None:
+                                await handling
+                        except msgspec.DecodeError as e:
+                            log.error("Message decode error: {} - Message: {}", e, message[:100])
+                        except Exception as e:
+                            log.error("Error processing message: {} - {}", type(e).__name__, e)
+                            
+            except ConnectionClosed as e:
+                if self.is_running:
+                    log.warning(f"WebSocket connection closed: {e.code} {e.reason}")
+            except WebSocketException as e:
+                if self.is_running:
+                    log.error(f"WebSocket error: {type(e).__name__} - {str(e)}")
+            except asyncio.CancelledError:
+                log.info("Multiplexed WebSocket task cancelled")
+                break
+            except Exception as e:
+                if self.is_running:
+                    log.error(f"Unexpected error in multiplexed WebSocket: {type(e).__name__} - {str(e)}")
+            
+            # Reconnection logic with exponential backoff
+            if self.is_running:
+                delay = RECONNECT_DELAYS[min(self.reconnect_attempts, len(RECONNECT_DELAYS) - 1)]
+                self.reconnect_attempts += 1
+                log.info("Reconnecting in {}s...", delay)
+                await asyncio.sleep(delay)
+    
+    def _route_message(self, message: Union[str, bytes]) -> Optional[Awaitable]:
+        """
+        Parse a stream event and start its symbol's handler.
+        
+        Returns the handler's coroutine for the caller to await, or None
+        for replies to stream requests and unsubscribed streams.
+        """
+        try:
+            wrapped = _stream_decoder.decode(message)
+        except msgspec.ValidationError:
+            # Replies to SUBSCRIBE/UNSUBSCRIBE: {"result": null, "id": n}
+            reply = msgspec.json.decode(message)
+            if not isinstance(reply, dict) or "id" not in reply:
+                raise
+            if reply.get("error"):
+                log.error("Stream request {} failed: {}", reply["id"], reply["error"])
+            return None
+        
+        handler = self._stream_handlers.get(wrapped.stream)
+        if handler is None:
+            return None
+        return handler(wrapped.data)
+    
+    async def disconnect(self):
+        """Close the shared connection gracefully."""
+        self.is_running = False
+        
+        if self.websocket and not self.websocket.closed:
+            await self.websocket.close()
+        
+        if self.task and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        
+        self.websocket = None
+        self._live_streams = set()
+        log.info("Disconnected multiplexed WebSocket")
+
+
 class WebSocketManager:
     """
-    Manages multiple Binance WebSocket connections.
-    Handles symbol subscription/unsubscription and connection lifecycle.
+    Manages Binance WebSocket streams for many symbols.
+    Handles symbol subscription/unsubscription over one shared connection.
     """
     
     def __init__(self, on_tick: Callable, on_ticker: Optional[Callable] = None):
@@ -260,7 +522,8 @@ class WebSocketManager:
         """
         self.on_tick = on_tick
         self.on_ticker = on_ticker
-        self.clients: Dict[str, BinanceWebSocketClient] = {}
+        self.connection = MultiplexedBinanceClient()
+        self.clients: Dict[str, BinanceWebSocketClient] = self.connection.clients
     
     async def subscribe(self, symbol: str):
         """
@@ -269,21 +532,7 @@ class WebSocketManager:
         Args:
             symbol: Trading symbol to subscribe
         """
-        symbol = normalize_symbol(symbol)
-        
-        if symbol in self.clients:
-            log.warning(f"Already subscribed to {symbol}, reusing existing connection")
-            return
-        
-        try:
-            # Create and start new client
-            client = BinanceWebSocketClient(symbol, self.on_tick, self.on_ticker)
-            await client.connect()
-            self.clients[symbol] = client
-            log.info(f"✅ Successfully subscribed to {symbol}")
-        except Exception as e:
-            log.error(f"Failed to subscribe to {symbol}: {type(e).__name__} - {str(e)}")
-            raise
+        await self.subscribe_multiple([symbol])
     
     async def unsubscribe(self, symbol: str):
         """
@@ -292,51 +541,41 @@ class WebSocketManager:
         Args:
             symbol: Trading symbol to unsubscribe
         """
-        symbol = normalize_symbol(symbol)
-        
-        if symbol not in self.clients:
-            log.warning(f"Not subscribed to {symbol}")
-            return
-        
-        # Stop and remove client
-        await self.clients[symbol].disconnect()
-        del self.clients[symbol]
-        log.info(f"Unsubscribed from {symbol}")
+        await self.unsubscribe_multiple([symbol])
     
     async def subscribe_multiple(self, symbols: list[str]):
-        """Subscribe to multiple symbols with staggered connection timing."""
+        """Subscribe to multiple symbols with a single stream request."""
         log.info(f"Starting subscription for symbols: {symbols}")
         
-        success_count = 0
-        failed_symbols = []
-        
-        # Subscribe with small delay between each to avoid connection race conditions
-        for symbol in symbols:
-            try:
-                await self.subscribe(symbol)
-                success_count += 1
-                # Small delay to stagger connections
-                if len(symbols) > 1:
-                    await asyncio.sleep(0.5)
-            except Exception as e:
-                failed_symbols.append(symbol)
-                log.error(f"Failed to subscribe to {symbol}: {type(e).__name__} - {str(e)}")
+        new_clients = []
+        for symbol in dict.fromkeys(normalize_symbol(s) for s in symbols):
+            if symbol in self.clients:
+                log.warning(f"Already subscribed to {symbol}, reusing existing connection")
+            else:
+                new_clients.append(BinanceWebSocketClient(symbol, self.on_tick, self.on_ticker))
         
-        log.info(f"✅ Subscription complete: {success_count}/{len(symbols)} successful")
-        if failed_symbols:
-            log.warning(f"⚠️ Failed symbols: {failed_symbols}")
+        try:
+            await self.connection.add(new_clients)
+        except Exception as e:
+            log.error(f"Failed to subscribe to {symbols}: {type(e).__name__} - {str(e)}")
+            raise
         
-        return {"success": success_count, "failed": failed_symbols}
+        log.info(f"✅ Subscription complete: {len(symbols)}/{len(symbols)} successful")
+        return {"success": len(symbols), "failed": []}
     
     async def unsubscribe_multiple(self, symbols: list[str]):
-        """Unsubscribe from multiple symbols concurrently."""
-        tasks = [self.unsubscribe(symbol) for symbol in symbols]
-        await asyncio.gather(*tasks, return_exceptions=True)
+        """Unsubscribe from multiple symbols with a single stream request."""
+        subscribed = [s for s in map(normalize_symbol, symbols) if s in self.clients]
+        for symbol in set(map(normalize_symbol, symbols)) - set(subscribed):
+            log.warning(f"Not subscribed to {symbol}")
+        
+        if subscribed:
+            await self.connection.remove(subscribed)
+            log.info(f"Unsubscribed from {subscribed}")
     
     async def disconnect_all(self):
         """Disconnect all active WebSocket connections."""
-        symbols = list(self.clients.keys())
-        await self.unsubscribe_multiple(symbols)
+        await self.connection.remove(list(self.clients))
         log.info("All WebSocket connections closed")
     
     def get_active_symbols(self) -> list[str]:
@@ -0,0 +1,34 @@
+"""
+Gunicorn configuration for running the backend with Uvicorn workers.
+
+Usage:
+    gunicorn app:app -c gunicorn_conf.py
+
+Tick buffers, Binance streams and alert rules live in process memory, so
+each worker holds its own copy of that state. Keep a single worker unless
+clients are pinned to one worker (sticky sessions) or only the stateless
+database/analytics endpoints are being scaled out. Set WEB_CONCURRENCY to
+change the worker count (e.g. 2 * CPU cores + 1 for the stateless case).
+"""
+import multiprocessing
+import os
+
+from utils import settings
+
+# Server socket
+bind = f"{settings.host}:{settings.port}"
+
+# Worker processes
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+max_cpu_workers = 2 * multiprocessing.cpu_count() + 1
+workers = max(1, min(workers, max_cpu_workers))
+
+# Load the application once in the master so workers share read-only
+# module state (settings, compiled kernels) via copy-on-write
+preload_app = True
+
+# Logging
+accesslog = "logs/access.log"
+errorlog = "logs/error.log"
+loglevel = settings.log_level.lower()
@@ -3,8 +3,9 @@ Background task for computing analytics periodically.
 Consumes in-memory tick data, computes analytics, and stores the latest results.
 """
 import asyncio
-from typing import Dict, Any, List
-from datetime import datetime
+import time
+from itertools import combinations
+from typing import Dict, Any, Iterable, List
 
 from utils import log
 from core import data_manager, analytics_engine
@@ -29,6 +30,8 @@ class AnalyticsProcessor:
         self.interval = interval
         self.running = False
         self.task = None
+        # pair -> {"cache_key", "data", "timestamp"}; timestamp is the
+        # computation time in ns since the epoch
         self.latest_results: Dict[str, Dict[str, Any]] = {}
     
     async def start(self):
@@ -77,21 +80,16 @@ class AnalyticsProcessor:
                 return
             
             # Generate all pairs from available symbols
-            pairs = self._generate_pairs(list(symbols))
+            pairs = self._generate_pairs(symbols)
             
-            log.debug(f"Processing {len(pairs)} pairs: {pairs[:3]}..." if len(pairs) > 3 else f"Processing {len(pairs)} pairs")
+            log.debug("Processing {} pairs: {}", len(pairs), pairs[:3])
             
-            # Process each pair
-            for pair in pairs:
-                try:
-                    await self._process_pair(pair)
-                except Exception as e:
-                    log.error(f"Error processing pair {pair}: {e}")
+            await self._process_pairs(pairs)
         
         except Exception as e:
             log.error(f"Error in _process_all_pairs: {e}")
     
-    def _generate_pairs(self, symbols: List[str]) -> List[str]:
+    def _generate_pairs(self, symbols: Iterable[str]) -> List[str]:
         """
         Generate trading pairs from available symbols.
         
@@ -101,11 +99,7 @@ class AnalyticsProcessor:
         Returns:
             List of pair strings in format "SYMBOL_A-SYMBOL_B"
         """
-        pairs = []
-        for i, sym_a in enumerate(symbols):
-            for sym_b in symbols[i+1:]:
-                pairs.append(f"{sym_a}-{sym_b}")
-        return pairs
+        return [f"{sym_a}-{sym_b}" for sym_a, sym_b in combinations(symbols, 2)]
     
     async def _process_pair(self, pair: str):
         """
@@ -114,43 +108,79 @@ class AnalyticsProcessor:
         Args:
             pair: Trading pair in format "SYMBOL_A-SYMBOL_B"
         """
+        await self._process_pairs([pair])
+    
+    async def _process_pairs(self, pairs: List[str]):
+        """
+        Recompute analytics for the pairs whose legs have new ticks.
+        
+        The pairs are computed together in one worker thread, so each
+        symbol is resampled once per pass and the event loop stays free.
+        
+        Args:
+            pairs: Trading pairs in format "SYMBOL_A-SYMBOL_B"
+        """
         try:
             # Default parameters (can be made configurable)
             timeframe = "1m"
             window = 60
             regression = "OLS"
             
-            # Check if analytics are already cached and fresh
-            cache_key = f"{pair}:{timeframe}:{window}:{regression}"
-            cached = self.latest_results.get(pair)
+            # Check which analytics are already cached and fresh: the key
+            # includes the tick buffer versions of both legs, so results
+            # are recomputed only once either leg has new ticks
+            stale = []
+            for pair in pairs:
+                symbol_a, symbol_b = pair.split("-")
+                cache_key = (
+                    pair,
+                    timeframe,
+                    window,
+                    regression,
+                    data_manager.tick_versions.get(symbol_a, 0),
+                    data_manager.tick_versions.get(symbol_b, 0),
+                )
+                cached = self.latest_results.get(pair)
+                
+                if cached and cached.get("cache_key") == cache_key:
+                    log.debug("Skipping {} - no new ticks since last computation", pair)
+                    continue
+                stale.append((pair, cache_key))
             
-            if cached and cached.get("cache_key") == cache_key:
-                log.debug(f"Skipping {pair} - analytics already cached in-memory")
+            if not stale:
                 return
             
             # Compute analytics
-            analytics = analytics_engine.compute_pair_analytics(
-                pair=pair,
-                timeframe=timeframe,
-                window=window,
-                regression=regression
+            results = await asyncio.to_thread(
+                analytics_engine.compute_batch_analytics,
+                [
+                    {
+                        "pair": pair,
+                        "timeframe": timeframe,
+                        "window": window,
+                        "regression": regression,
+                    }
+                    for pair, _ in stale
+                ]
             )
             
-            if not analytics or "error" in analytics:
-                log.debug(f"No analytics for {pair}: {analytics.get('error', 'No data')}")
-                return
-            
-            # Cache result in-memory for quick reuse
-            self.latest_results[pair] = {
-                "cache_key": cache_key,
-                "data": analytics,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            log.debug(f"Processed analytics for {pair}")
+            timestamp = time.time_ns()
+            for (pair, cache_key), analytics in zip(stale, results):
+                if not analytics or "error" in analytics:
+                    log.debug("No analytics for {}: {}", pair, analytics.get("error", "No data"))
+                    continue
+                
+                # Cache result in-memory for quick reuse
+                self.latest_results[pair] = {
+                    "cache_key": cache_key,
+                    "data": analytics,
+                    "timestamp": timestamp
+                }
+                
+                log.debug("Processed analytics for {}", pair)
         
         except Exception as e:
-            log.error(f"Error processing pair {pair}: {e}")
+            log.error(f"Error processing pairs {pairs}: {e}")
 
 
 # Global instance
@@ -109,11 +109,15 @@ def test_database():
     print("✅ All tests passed successfully!")
     print("=" * 60)
     
-    # Cleanup test database
+    # Cleanup test database (including WAL sidecar files)
     import os
+    db.close()
     if os.path.exists("test_market_data.db"):
         os.remove("test_market_data.db")
         print("\n✓ Test database cleaned up")
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(f"test_market_data.db{suffix}"):
+            os.remove(f"test_market_data.db{suffix}")
 
 
 if __name__ == "__main__":
@@ -1,28 +1,45 @@
 """Utils package initialization."""
 from .config import settings
 from .logger import log
+from .cache import cached, LRUCache
 from .helpers import (
     normalize_symbol,
     current_timestamp,
     parse_timestamp,
     format_timestamp,
+    iso_to_epoch_ns,
+    epoch_ns_to_iso,
     resample_to_ohlcv,
+    resample_arrays_to_ohlcv,
     calculate_returns,
     safe_division,
+    safe_division_array,
     timeframe_to_seconds,
     timeframe_to_pandas_rule,
+    pandas_rule_to_ns,
+    make_etag,
+    etag_matches,
 )
 
 __all__ = [
     "settings",
     "log",
+    "cached",
+    "LRUCache",
     "normalize_symbol",
     "current_timestamp",
     "parse_timestamp",
     "format_timestamp",
+    "iso_to_epoch_ns",
+    "epoch_ns_to_iso",
     "resample_to_ohlcv",
+    "resample_arrays_to_ohlcv",
     "calculate_returns",
     "safe_division",
+    "safe_division_array",
     "timeframe_to_seconds",
     "timeframe_to_pandas_rule",
+    "pandas_rule_to_ns",
+    "make_etag",
+    "etag_matches",
 ]
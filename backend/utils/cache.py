@@ -0,0 +1,98 @@
+"""
+In-memory TTL caching for read-mostly async endpoints, and a bounded LRU map.
+Keeps the in-memory mode used elsewhere in the backend (no Redis round-trip).
+"""
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def cached(ttl: float, maxsize: int = 128) -> Callable:
+    """
+    Cache the result of an async function for ``ttl`` seconds.
+
+    Results are keyed by the call arguments, so they must be hashable. At
+    most ``maxsize`` results are kept, evicting the least recently used, so
+    free-text arguments can't grow the store without bound.
+
+    Args:
+        ttl: Time-to-live in seconds
+        maxsize: Maximum number of cached results
+
+    Returns:
+        Decorator for async functions
+    """
+    def decorator(func: Callable) -> Callable:
+        entries = LRUCache(maxsize)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+
+            entry = entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    return entry[1]
+                # Expired: drop it so a failing call doesn't leave it behind
+                del entries[key]
+
+            result = await func(*args, **kwargs)
+            entries[key] = (now + ttl, result)
+            return result
+
+        wrapper.cache_clear = entries.clear
+        return wrapper
+
+    return decorator
+
+
+class LRUCache(OrderedDict):
+    """
+    Mapping bounded to ``maxsize`` entries, evicting the least recently used.
+
+    Lookups through get() refresh recency and count hits and misses. Not
+    thread-safe: callers hold their own lock.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        on_evict: Optional[Callable[[Hashable], None]] = None
+    ):
+        """
+        Args:
+            maxsize: Maximum number of entries
+            on_evict: Called with the key of each evicted entry
+        """
+        super().__init__()
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if key in self:
+            self.move_to_end(key)
+            self.hits += 1
+            return self[key]
+        self.misses += 1
+        return default
+
+    def __setitem__(self, key: Hashable, value: Any):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            evicted, _ = self.popitem(last=False)
+            if self.on_evict is not None:
+                self.on_evict(evicted)
+
+    def stats(self) -> Dict[str, int]:
+        """Current size and hit/miss counters."""
+        return {
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -3,7 +3,8 @@ Configuration management for the Quant Analytics backend.
 Loads settings from environment variables with sensible defaults.
 """
 import os
-from typing import List, Optional
+from functools import cached_property
+from typing import FrozenSet, List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -18,6 +19,7 @@ class Settings(BaseSettings):
     # Data Configuration
     tick_buffer_size: int = Field(default=10000, env="TICK_BUFFER_SIZE")
     resample_intervals: str = Field(default="1s,1m,5m", env="RESAMPLE_INTERVALS")
+    ohlcv_cache_size: int = Field(default=256, env="OHLCV_CACHE_SIZE")
     max_symbols: int = Field(default=2, env="MAX_SYMBOLS")
     
     # Binance WebSocket
@@ -50,20 +52,30 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
         case_sensitive = False
     
-    @property
+    @cached_property
     def symbols_list(self) -> List[str]:
-        """Parse available symbols as list."""
+        """Parse available symbols as list (parsed once; don't mutate)."""
         return [s.strip().upper() for s in self.available_symbols.split(",")]
     
-    @property
+    @cached_property
+    def symbols_set(self) -> FrozenSet[str]:
+        """Available symbols as a frozenset for membership checks."""
+        return frozenset(self.symbols_list)
+    
+    @cached_property
     def cors_origins_list(self) -> List[str]:
-        """Parse CORS origins as list."""
+        """Parse CORS origins as list (parsed once; don't mutate)."""
         return [o.strip() for o in self.cors_origins.split(",")]
     
-    @property
+    @cached_property
     def resample_intervals_list(self) -> List[str]:
-        """Parse resample intervals as list."""
+        """Parse resample intervals as list (parsed once; don't mutate)."""
         return [i.strip() for i in self.resample_intervals.split(",")]
+    
+    @cached_property
+    def resample_intervals_set(self) -> FrozenSet[str]:
+        """Resample intervals as a frozenset for membership checks."""
+        return frozenset(self.resample_intervals_list)
 
 
 # Global settings instance
@@ -1,12 +1,16 @@
 """
 Utility helper functions for data processing and formatting.
 """
-from datetime import datetime, timezone
-from typing import Any, Dict, List
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Union
+import ciso8601
 import pandas as pd
 import numpy as np
+from numba import njit
 
 
+@lru_cache(maxsize=256)
 def normalize_symbol(symbol: str) -> str:
     """Normalize symbol to uppercase format."""
     return symbol.strip().upper()
@@ -37,67 +41,212 @@ def format_timestamp(dt: datetime) -> str:
     return dt.isoformat()
 
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def iso_to_epoch_ns(ts: str) -> int:
+    """Parse an ISO timestamp (naive means UTC) to integer nanoseconds since the epoch."""
+    dt = ciso8601.parse_datetime(ts)
+    if not dt.tzinfo:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - _EPOCH) // _ONE_MICROSECOND * 1000
+
+
+def epoch_ns_to_iso(ts_ns: np.ndarray) -> np.ndarray:
+    """
+    Format epoch nanoseconds as UTC ISO strings, vectorized.
+    
+    Matches datetime.isoformat(): microsecond precision, with the fraction
+    omitted for whole seconds.
+    
+    Args:
+        ts_ns: int64 nanoseconds since the epoch
+    
+    Returns:
+        Object array of ISO strings with a +00:00 offset
+    """
+    dt = np.asarray(ts_ns, dtype=np.int64).astype('datetime64[ns]')
+    iso = np.datetime_as_string(dt, unit='us').astype(object)
+    whole = (ts_ns % 1_000_000_000) == 0
+    if whole.any():
+        iso[whole] = np.datetime_as_string(dt[whole], unit='s')
+    return iso + '+00:00'
+
+
+def _iso_list_to_epoch_ns(timestamps: List[str]) -> np.ndarray:
+    """
+    Parse ISO timestamps to int64 nanoseconds since the epoch.
+    
+    Strings with a +00:00 offset (as epoch_ns_to_iso writes them) go
+    through NumPy's datetime64 parser with the offset stripped; any other
+    form falls back to pandas' general ISO8601 parser.
+    """
+    if all(ts.endswith('+00:00') for ts in timestamps):
+        return np.array([ts[:-6] for ts in timestamps], dtype='datetime64[ns]').view(np.int64)
+    return pd.to_datetime(timestamps, utc=True, format='ISO8601').asi8
+
+
+OHLCV_COLUMNS = ['ts', 'open', 'high', 'low', 'close', 'volume']
+
+
+@njit(
+    "Tuple((int64[:], float64[:], float64[:], float64[:], float64[:], float64[:]))"
+    "(int64[:], float64[:], float64[:], int64)",
+    cache=True,
+)
+def _bucket_ohlcv(ts_ns, price, qty, period_ns):
+    """
+    Aggregate time-sorted ticks into OHLCV buckets of ``period_ns`` nanoseconds.
+    
+    Buckets are aligned to the Unix epoch, like pandas resample for rules
+    that divide a day. Only buckets containing ticks are returned. All five
+    aggregates are accumulated in one pass over the ticks.
+    
+    Args:
+        ts_ns: Tick timestamps as int64 nanoseconds since the epoch (sorted)
+        price: Tick prices
+        qty: Tick quantities
+        period_ns: Bucket size in nanoseconds
+    
+    Returns:
+        Tuple of bucket start (ns), open, high, low, close and volume arrays
+    """
+    n = len(ts_ns)
+    starts = np.empty(n, np.int64)
+    opens = np.empty(n)
+    highs = np.empty(n)
+    lows = np.empty(n)
+    closes = np.empty(n)
+    volumes = np.empty(n)
+    
+    count = 0
+    bucket = ts_ns[0] // period_ns
+    high = low = close = price[0]
+    volume = 0.0
+    starts[0] = bucket * period_ns
+    opens[0] = close
+    
+    for i in range(n):
+        current = ts_ns[i] // period_ns
+        p = price[i]
+        if current != bucket:
+            # Close out the previous bucket and start a new one
+            highs[count] = high
+            lows[count] = low
+            closes[count] = close
+            volumes[count] = volume
+            count += 1
+            bucket = current
+            starts[count] = current * period_ns
+            opens[count] = p
+            high = low = p
+            volume = 0.0
+        high = max(high, p)
+        low = min(low, p)
+        close = p
+        volume += qty[i]
+    
+    highs[count] = high
+    lows[count] = low
+    closes[count] = close
+    volumes[count] = volume
+    count += 1
+    
+    return (
+        starts[:count], opens[:count], highs[:count],
+        lows[:count], closes[:count], volumes[:count],
+    )
+
+
 def resample_to_ohlcv(
-    ticks: List[Dict[str, Any]],
+    ticks: Union[List[Dict[str, Any]], Any],
     timeframe: str
 ) -> pd.DataFrame:
     """
     Resample tick data to OHLCV format.
     
     Args:
-        ticks: List of tick dictionaries with 'ts', 'price', 'qty'
+        ticks: List of tick dictionaries with 'ts', 'price', 'qty', and
+            optionally 'ts_ns' (used instead of parsing 'ts' when every
+            tick has it); or a columnar tick store such as
+            core.data_manager.TickBuffer, whose arrays() returns
+            (ts_ns, price, qty) and is resampled without building dicts
         timeframe: Pandas resample rule (e.g., '1s', '1min', '5min')
     
     Returns:
         DataFrame with OHLCV columns
     """
+    if hasattr(ticks, 'arrays'):
+        return resample_arrays_to_ohlcv(*ticks.arrays(), timeframe)
+    
     if not ticks:
-        return pd.DataFrame(columns=['ts', 'open', 'high', 'low', 'close', 'volume'])
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
     
-    # Convert to DataFrame
-    df = pd.DataFrame(ticks)
-    df['ts'] = pd.to_datetime(df['ts'], utc=True, format='ISO8601')
-    df['price'] = df['price'].astype(float)
-    df['qty'] = df['qty'].astype(float)
+    n = len(ticks)
+    if all('ts_ns' in tick for tick in ticks):
+        ts_ns = np.fromiter((tick['ts_ns'] for tick in ticks), dtype=np.int64, count=n)
+    else:
+        ts_ns = _iso_list_to_epoch_ns([tick['ts'] for tick in ticks])
+    price = np.fromiter((tick['price'] for tick in ticks), dtype=np.float64, count=n)
+    qty = np.fromiter((tick['qty'] for tick in ticks), dtype=np.float64, count=n)
     
-    # Set timestamp as index
-    df = df.set_index('ts')
+    return resample_arrays_to_ohlcv(ts_ns, price, qty, timeframe)
+
+
+def resample_arrays_to_ohlcv(
+    ts_ns: np.ndarray,
+    price: np.ndarray,
+    qty: np.ndarray,
+    timeframe: str
+) -> pd.DataFrame:
+    """
+    Resample tick arrays to OHLCV format.
     
-    # Resample to OHLCV
-    ohlcv = df['price'].resample(timeframe).ohlc()
-    ohlcv['volume'] = df['qty'].resample(timeframe).sum(min_count=1)
+    Args:
+        ts_ns: Tick timestamps as int64 nanoseconds since the epoch
+        price: Tick prices
+        qty: Tick quantities
+        timeframe: Pandas resample rule (e.g., '1s', '1min', '5min')
     
-    # Drop periods with no price information
-    ohlcv = ohlcv.dropna(how='all')
+    Returns:
+        DataFrame with OHLCV columns
+    """
+    if not len(ts_ns):
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
     
-    if ohlcv.empty:
-        return pd.DataFrame(columns=['ts', 'open', 'high', 'low', 'close', 'volume'])
-
-    # Replace zero or missing price values and forward/back fill
-    price_cols = ['open', 'high', 'low', 'close']
-    ohlcv[price_cols] = ohlcv[price_cols].replace(0, np.nan)
-    ohlcv[price_cols] = ohlcv[price_cols].ffill().bfill()
-
-    # Ensure price hierarchy consistency after filling
-    ohlcv['high'] = ohlcv[price_cols].max(axis=1)
-    ohlcv['low'] = ohlcv[price_cols].min(axis=1)
+    if len(ts_ns) > 1 and (np.diff(ts_ns) < 0).any():
+        order = np.argsort(ts_ns, kind='stable')
+        ts_ns, price, qty = ts_ns[order], price[order], qty[order]
     
-    # Fill missing volumes with zero
-    ohlcv['volume'] = ohlcv['volume'].fillna(0.0)
+    # Single-pass compiled bucket aggregation over the typed arrays
+    bars = dict(zip(OHLCV_COLUMNS, _bucket_ohlcv(
+        np.ascontiguousarray(ts_ns, dtype=np.int64),
+        np.ascontiguousarray(price, dtype=np.float64),
+        np.ascontiguousarray(qty, dtype=np.float64),
+        pandas_rule_to_ns(timeframe),
+    )))
+    ohlcv = pd.DataFrame(bars, columns=OHLCV_COLUMNS)
     
-    # Reset index
-    ohlcv = ohlcv.reset_index()
-    ohlcv.columns = ['ts', 'open', 'high', 'low', 'close', 'volume']
+    # Replace zero price values and forward/back fill
+    if not price.all():
+        price_cols = ['open', 'high', 'low', 'close']
+        ohlcv[price_cols] = ohlcv[price_cols].replace(0, np.nan)
+        ohlcv[price_cols] = ohlcv[price_cols].ffill().bfill()
+        
+        # Ensure price hierarchy consistency after filling
+        ohlcv['high'] = ohlcv[price_cols].max(axis=1)
+        ohlcv['low'] = ohlcv[price_cols].min(axis=1)
     
-    # Convert timestamp to ISO string
-    ohlcv['ts'] = ohlcv['ts'].apply(lambda x: x.isoformat())
+    ohlcv['ts'] = epoch_ns_to_iso(bars['ts'])
     
     return ohlcv
 
 
 def calculate_returns(prices: pd.Series) -> pd.Series:
     """Calculate log returns from price series."""
-    return np.log(prices / prices.shift(1))
+    log_prices = np.log(prices.to_numpy(dtype=np.float64))
+    return pd.Series(np.diff(log_prices, prepend=np.nan), index=prices.index, name=prices.name)
 
 
 def safe_division(numerator: float, denominator: float, default: float = 0.0) -> float:
@@ -107,6 +256,17 @@ def safe_division(numerator: float, denominator: float, default: float = 0.0) ->
     return numerator / denominator
 
 
+def safe_division_array(numerator: Any, denominator: Any, default: float = 0.0) -> np.ndarray:
+    """Element-wise safe_division over arrays, in one vectorized pass."""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    out = np.full(np.broadcast_shapes(numerator.shape, denominator.shape), default)
+    valid = (denominator != 0) & ~np.isnan(denominator) & ~np.isnan(numerator)
+    np.divide(numerator, denominator, out=out, where=valid)
+    return out
+
+
+@lru_cache(maxsize=64)
 def timeframe_to_seconds(tf: str) -> int:
     """Convert timeframe string to seconds."""
     mapping = {
@@ -120,6 +280,7 @@ def timeframe_to_seconds(tf: str) -> int:
     return mapping.get(tf.lower(), 60)
 
 
+@lru_cache(maxsize=64)
 def timeframe_to_pandas_rule(tf: str) -> str:
     """Convert timeframe string to pandas resample rule."""
     mapping = {
@@ -131,3 +292,23 @@ def timeframe_to_pandas_rule(tf: str) -> str:
         '1d': '1d',
     }
     return mapping.get(tf.lower(), '1min')
+
+
+@lru_cache(maxsize=64)
+def pandas_rule_to_ns(rule: str) -> int:
+    """Length of a fixed pandas frequency rule in nanoseconds."""
+    return pd.Timedelta(rule).value
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a quoted ETag value from the given parts."""
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check whether an If-None-Match header value matches an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip() for tag in if_none_match.split(","))
@@ -23,7 +23,9 @@ def setup_logger():
         colorize=True,
     )
     
-    # Add file handler with rotation
+    # Add file handler with rotation. Enqueued, so file writes and the
+    # nightly rotation/compression run on loguru's writer thread instead
+    # of blocking whichever coroutine logged
     logger.add(
         "logs/app_{time:YYYY-MM-DD}.log",
         rotation="00:00",
@@ -31,6 +33,7 @@ def setup_logger():
         compression="zip",
         format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} | {message}",
         level=settings.log_level,
+        enqueue=True,
     )
     
     return logger
@@ -7,6 +7,7 @@ served to the React frontend.
 """
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Iterable, Optional, Sequence
 
@@ -21,6 +22,17 @@ _TIMEFRAME_RULES = {
     "5m": "5min",
 }
 
+# Bucket length of each rule, parsed once rather than per resample.
+_TIMEFRAME_PERIODS_NS = {
+    timeframe: pd.Timedelta(rule).value for timeframe, rule in _TIMEFRAME_RULES.items()
+}
+
+
+# Figures built with ``reuse_figure=True``, keyed by chart settings and the
+# candle time range, with the candle values they were drawn from.
+_FIGURE_CACHE: OrderedDict[tuple, tuple[go.Figure, np.ndarray]] = OrderedDict()
+_FIGURE_CACHE_SIZE = 16
+
 
 @dataclass(frozen=True)
 class MovingAverageSpec:
@@ -47,37 +59,164 @@ def _resample(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
         Input DataFrame containing ``timestamp, open, high, low, close, volume``.
     timeframe:
         One of ``{"1s", "1m", "5m"}``. Defaults to ``1m`` when unsupported.
+
+    Bars are bucketed with NumPy rather than ``DataFrame.resample``; input
+    prices are expected to be present, as missing values are not skipped.
     """
 
     if df.empty:
-        return df.copy()
+        return df.iloc[:0]
 
-    rule = _TIMEFRAME_RULES.get(timeframe, _TIMEFRAME_RULES["1m"])
+    period_ns = _TIMEFRAME_PERIODS_NS.get(timeframe, _TIMEFRAME_PERIODS_NS["1m"])
 
-    working = df.copy()
-    if not np.issubdtype(working["timestamp"].dtype, np.datetime64):
-        working["timestamp"] = pd.to_datetime(working["timestamp"], utc=True)
+    timestamps = pd.to_datetime(df["timestamp"], utc=True)
+    ts_ns = timestamps.to_numpy(dtype="datetime64[ns]").view(np.int64)
+    opens, highs, lows, closes, volumes = (
+        df[column].to_numpy(dtype=np.float64)
+        for column in ("open", "high", "low", "close", "volume")
+    )
 
-    working = working.set_index("timestamp").sort_index()
+    # Candles normally arrive in time order; only sort when they don't.
+    if (np.diff(ts_ns) < 0).any():
+        order = np.argsort(ts_ns, kind="stable")
+        ts_ns, opens, highs, lows, closes, volumes = (
+            values[order] for values in (ts_ns, opens, highs, lows, closes, volumes)
+        )
 
-    ohlcv = working.resample(rule).agg(
-        open=("open", "first"),
-        high=("high", "max"),
-        low=("low", "min"),
-        close=("close", "last"),
-        volume=("volume", "sum"),
+    # Epoch-aligned buckets, reduced over runs of equal bucket ids. Every
+    # bucket between the first and last keeps a row, as resample does.
+    buckets = ts_ns // period_ns
+    starts = np.flatnonzero(np.diff(buckets, prepend=buckets[0] - 1))
+    ends = np.append(starts[1:], len(buckets)) - 1
+    slots = buckets[starts] - buckets[0]
+    size = int(slots[-1]) + 1
+
+    def spread(values: np.ndarray, fill: float) -> np.ndarray:
+        out = np.full(size, fill)
+        out[slots] = values
+        return out
+
+    ohlcv = pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime((buckets[0] + np.arange(size)) * period_ns, utc=True),
+            "open": spread(opens[starts], np.nan),
+            "high": spread(np.maximum.reduceat(highs, starts), np.nan),
+            "low": spread(np.minimum.reduceat(lows, starts), np.nan),
+            "close": spread(closes[ends], np.nan),
+            "volume": spread(np.add.reduceat(volumes, starts), 0.0),
+        }
     )
 
     # Forward-fill missing closes so line overlays stay continuous.
     ohlcv["close"] = ohlcv["close"].ffill()
 
-    # Drop rows without trading activity.
-    ohlcv = ohlcv.dropna(subset=["open", "high", "low", "close"], how="all")
+    return ohlcv
+
+
+class IncrementalResampler:
+    """Resample a candle history across redraws, re-aggregating only its newest bucket.
+
+    Buckets before the most recent one are treated as final, so each call
+    only resamples rows from the last bucket onwards and appends them to the
+    buckets kept from earlier calls. The history may grow at the end and,
+    when it starts on a bucket boundary (as candles do), drop rows at the
+    start; any other change to it falls back to a full resample. Pass one
+    instance per live chart to :func:`plot_candles`.
+    """
+
+    def __init__(self) -> None:
+        self.timeframe: Optional[str] = None
+        self.frozen_ohlcv: Optional[pd.DataFrame] = None
+        self.first_timestamp: Optional[pd.Timestamp] = None
+        self.last_bucket_start: Optional[pd.Timestamp] = None
+
+    def reset(self) -> None:
+        """Forget the cached buckets."""
+        self.frozen_ohlcv = None
+        self.first_timestamp = None
+        self.last_bucket_start = None
+
+    def __call__(self, df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+        if timeframe != self.timeframe:
+            self.timeframe = timeframe
+            self.reset()
+
+        if df.empty:
+            self.reset()
+            return _resample(df, timeframe)
+
+        timestamps = pd.to_datetime(df["timestamp"], utc=True)
+        first = timestamps.min()
+        period_ns = _TIMEFRAME_PERIODS_NS.get(timeframe, _TIMEFRAME_PERIODS_NS["1m"])
+        on_boundary = first.value % period_ns == 0
+
+        ohlcv = None
+        if self.last_bucket_start is not None and self.last_bucket_start >= first:
+            frozen = self.frozen_ohlcv
+            if first != self.first_timestamp and on_boundary:
+                # Rows dropped from the start took whole buckets with them
+                frozen = frozen[(frozen["timestamp"] >= first).to_numpy()]
+            if first == self.first_timestamp or on_boundary:
+                ohlcv = _resample(df[(timestamps >= self.last_bucket_start).to_numpy()], timeframe)
+                if not frozen.empty:
+                    ohlcv = pd.concat([frozen, ohlcv], ignore_index=True)
+
+        if ohlcv is None:
+            ohlcv = _resample(df, timeframe)
+
+        self.frozen_ohlcv = ohlcv.iloc[:-1]
+        self.first_timestamp = first
+        self.last_bucket_start = ohlcv["timestamp"].iloc[-1]
+        return ohlcv
+
+
+def _merge_candles(ohlcv: pd.DataFrame, max_points: int) -> tuple[pd.DataFrame, np.ndarray, int]:
+    """Merge runs of consecutive candles so at most ``max_points`` remain.
+
+    Each merged candle keeps the first open, highest high, lowest low, last
+    close and total volume of its run, so wicks survive the downsampling.
+
+    Returns
+    -------
+    tuple
+        The merged candles, the position of each run's last source candle,
+        and the number of source candles per merged candle.
+    """
+
+    per = -(-len(ohlcv) // max_points)
+    if per <= 1:
+        return ohlcv, np.arange(len(ohlcv)), 1
+
+    size = len(ohlcv)
+    starts = np.arange(0, size, per)
+    ends = np.minimum(starts + per, size) - 1
 
-    return ohlcv.reset_index()
+    opens, highs, lows, closes, volumes = (
+        ohlcv[column].to_numpy(dtype=np.float64)
+        for column in ("open", "high", "low", "close", "volume")
+    )
+
+    # Gap candles carry NaN prices, so take each run's first present open
+    # and last present close, and let fmax/fmin skip the gaps' NaNs.
+    present = np.append(np.flatnonzero(~np.isnan(opens)), size)
+    first = present[np.searchsorted(present, starts)]
+    present = np.append(-1, np.flatnonzero(~np.isnan(closes)))
+    last = present[np.searchsorted(present, ends, side="right") - 1]
+
+    merged = pd.DataFrame(
+        {
+            "timestamp": ohlcv["timestamp"].iloc[starts].reset_index(drop=True),
+            "open": np.where(first <= ends, np.append(opens, np.nan)[np.minimum(first, size)], np.nan),
+            "high": np.fmax.reduceat(highs, starts),
+            "low": np.fmin.reduceat(lows, starts),
+            "close": np.where(last >= starts, np.append(closes, np.nan)[last], np.nan),
+            "volume": np.add.reduceat(volumes, starts),
+        }
+    )
+    return merged, ends, per
 
 
-def _compute_candle_width(index: pd.Index) -> Optional[float]:
+def _compute_candle_width(index: pd.Index | pd.Series) -> Optional[float]:
     """Return an initial candle width in milliseconds.
 
     Plotly's candlestick width is expressed in milliseconds for date axes.
@@ -88,26 +227,41 @@ def _compute_candle_width(index: pd.Index) -> Optional[float]:
     if len(index) < 2:
         return None
 
-    # Typical spacing between consecutive timestamps.
-    deltas = index.to_series().diff().dropna()
-    if deltas.empty:
-        return None
-
-    avg_ms = deltas.mean() / pd.Timedelta(milliseconds=1)
+    # Typical spacing between consecutive timestamps. The gaps sum to the
+    # overall span, so their mean needs only the first and last timestamp.
+    ns = pd.DatetimeIndex(index).asi8
+    avg_ms = (ns[-1] - ns[0]) / (len(ns) - 1) / 1e6
     # We keep the body slightly thinner than the gap to mimic TradingView.
     return float(avg_ms * 0.75)
 
 
 def _add_moving_averages(
-    fig: go.Figure, df: pd.DataFrame, moving_averages: Sequence[MovingAverageSpec]
+    fig: go.Figure,
+    df: pd.DataFrame,
+    moving_averages: Sequence[MovingAverageSpec],
+    index: Optional[pd.Series | np.ndarray] = None,
+    positions: Optional[np.ndarray] = None,
 ) -> None:
-    closes = df["close"].astype(float)
-    index = df["timestamp"]
+    """Overlay moving averages of ``df`` closes.
+
+    When candles were merged, averages are still taken over the source
+    candles and plotted at ``index`` using the values at ``positions``.
+    Every window is read off one running sum of the closes, which
+    :func:`_resample` forward-fills so no window spans a gap.
+    """
+    closes = df["close"].to_numpy(dtype=np.float64)
+    sums = np.concatenate(([0.0], np.cumsum(closes)))
+    if index is None:
+        index = df["timestamp"]
 
     for ma in moving_averages:
-        if len(closes) < ma.window:
+        window = ma.window
+        if len(closes) < window:
             continue
-        ma_values = closes.rolling(ma.window).mean()
+        ma_values = np.full(len(closes), np.nan)
+        ma_values[window - 1:] = (sums[window:] - sums[:-window]) / window
+        if positions is not None:
+            ma_values = ma_values[positions]
         fig.add_trace(
             go.Scatter(
                 x=index,
@@ -120,11 +274,48 @@ def _add_moving_averages(
         )
 
 
+def _patch_last_candle(
+    fig: go.Figure,
+    values: np.ndarray,
+    moving_averages: Sequence[MovingAverageSpec],
+) -> bool:
+    """Redraw the newest candle of ``fig`` in place from ``values``.
+
+    ``values`` holds the open, high, low, close and volume columns of the
+    candles ``fig`` shows. Returns False, leaving ``fig`` untouched, when the
+    candle's volume bar would move to the other colour's trace.
+    """
+
+    candles = fig.data[0]
+    open_, high, low, close, volume = values[-1]
+    up = close >= open_
+    if up != (candles.close[-1] >= candles.open[-1]):
+        return False
+
+    with fig.batch_update():
+        candles.open[-1] = open_
+        candles.high[-1] = high
+        candles.low[-1] = low
+        candles.close[-1] = close
+        fig.data[1 if up else 2].y[-1] = volume
+
+        closes = values[:, 3]
+        traces = iter(fig.data[3:])
+        for ma in moving_averages:
+            if len(closes) >= ma.window:
+                next(traces).y[-1] = closes[-ma.window:].mean()
+
+    return True
+
+
 def plot_candles(
     df: pd.DataFrame,
     timeframe: str = "1m",
     moving_averages: Sequence[MovingAverageSpec] = _DEFAULT_MAS,
     title: Optional[str] = None,
+    max_points: int = 5000,
+    resampler: Optional[IncrementalResampler] = None,
+    reuse_figure: bool = False,
 ) -> go.Figure:
     """Return a dark-themed Plotly candlestick chart with dynamic width.
 
@@ -132,12 +323,27 @@ def plot_candles(
     ----------
     df:
         DataFrame with columns ``timestamp, open, high, low, close, volume``.
+        Polars, PyArrow or other frames supporting the dataframe interchange
+        protocol are accepted too.
     timeframe:
         Resampling interval ("1s", "1m", "5m").
     moving_averages:
         Optional sequence describing MA overlays.
     title:
         Optional chart title.
+    max_points:
+        Most candles to draw. Longer histories are drawn with consecutive
+        candles merged; ``layout.meta['aggregation']`` gives how many source
+        candles each drawn candle covers, so callers can request finer data
+        for a narrower range.
+    resampler:
+        Optional :class:`IncrementalResampler` kept across redraws of a live
+        chart, so only the newest bucket is re-aggregated each time.
+    reuse_figure:
+        Return a figure from an earlier call with the same settings and
+        candle range when only its newest candle differs, updating that
+        candle in place instead of building a new figure. The figure is
+        shared between such calls, so serialize it before the next one.
 
     Notes
     -----
@@ -149,22 +355,52 @@ def plot_candles(
     * ``layout.uirevision`` keeps zoom level while updating data in real time.
     """
 
+    if not isinstance(df, pd.DataFrame) and hasattr(df, "__dataframe__"):
+        # Arrow-backed frames hand their column buffers over without copying
+        # where the dtypes allow it
+        df = pd.api.interchange.from_dataframe(df)
+
     if df.empty:
         raise ValueError("plot_candles expects a non-empty DataFrame")
 
-    ohlcv = _resample(df, timeframe)
+    ohlcv = resampler(df, timeframe) if resampler is not None else _resample(df, timeframe)
     if ohlcv.empty:
         raise ValueError("No data available after resampling")
 
-    ohlcv["timestamp"] = pd.to_datetime(ohlcv["timestamp"], utc=True)
+    # _resample already returns UTC datetimes
+    source = ohlcv
+    ohlcv, positions, aggregation = _merge_candles(source, max_points)
+
+    cache_key = None
+    if reuse_figure and aggregation == 1:
+        values = ohlcv[["open", "high", "low", "close", "volume"]].to_numpy(dtype=np.float64)
+        timestamps = ohlcv["timestamp"]
+        cache_key = (
+            timeframe, tuple(moving_averages or ()), title,
+            len(ohlcv), timestamps.iloc[0], timestamps.iloc[-1],
+        )
+        cached = _FIGURE_CACHE.get(cache_key)
+        if cached is not None:
+            fig, drawn = cached
+            if np.array_equal(drawn[:-1], values[:-1], equal_nan=True) and _patch_last_candle(
+                fig, values, moving_averages or ()
+            ):
+                _FIGURE_CACHE[cache_key] = (fig, values)
+                _FIGURE_CACHE.move_to_end(cache_key)
+                return fig
 
     candle_width = _compute_candle_width(ohlcv["timestamp"])
 
+    # Date axes take epoch milliseconds, and as a float64 array Plotly
+    # ships them base64-packed like the price columns rather than as one
+    # ISO string per candle.
+    x_ms = pd.DatetimeIndex(ohlcv["timestamp"]).asi8 / 1e6
+
     fig = go.Figure()
 
     fig.add_trace(
         go.Candlestick(
-            x=ohlcv["timestamp"],
+            x=x_ms,
             open=ohlcv["open"],
             high=ohlcv["high"],
             low=ohlcv["low"],
@@ -172,31 +408,38 @@ def plot_candles(
             increasing=dict(line=dict(color="#10b981", width=1.2)),
             decreasing=dict(line=dict(color="#ef4444", width=1.2)),
             name="Price",
-            hovertext=[ts.strftime("%Y-%m-%d %H:%M:%S") for ts in ohlcv["timestamp"]],
+            # Plotly formats the hovered time client-side, so no per-candle
+            # strings are built or shipped
+            xhoverformat="%Y-%m-%d %H:%M:%S",
             hovertemplate=(
-                "<b>%{hovertext}</b><br>Open: %{open:.2f}<br>High: %{high:.2f}<br>"
+                "<b>%{x}</b><br>Open: %{open:.2f}<br>High: %{high:.2f}<br>"
                 "Low: %{low:.2f}<br>Close: %{close:.2f}<extra></extra>"
             ),
-            width=candle_width,
         )
     )
 
-    colors = np.where(ohlcv["close"] >= ohlcv["open"], "rgba(16,185,129,0.7)", "rgba(239,68,68,0.7)")
-    fig.add_trace(
-        go.Bar(
-            x=ohlcv["timestamp"],
-            y=ohlcv["volume"],
-            name="Volume",
-            marker=dict(color=colors, line=dict(width=0)),
-            opacity=0.8,
-            yaxis="y2",
-            width=candle_width,
-            hoverinfo="skip",
+    # One bar trace per colour, so the renderer draws each set of volume
+    # bars in a single batch instead of switching colour bar by bar.
+    up = ohlcv["close"].to_numpy() >= ohlcv["open"].to_numpy()
+    volumes = ohlcv["volume"].to_numpy()
+    for mask, color, first in ((up, "rgba(16,185,129,0.7)", True), (~up, "rgba(239,68,68,0.7)", False)):
+        fig.add_trace(
+            go.Bar(
+                x=x_ms[mask],
+                y=volumes[mask],
+                name="Volume",
+                legendgroup="volume",
+                showlegend=first,
+                marker=dict(color=color, line=dict(width=0)),
+                opacity=0.8,
+                yaxis="y2",
+                width=candle_width,
+                hoverinfo="skip",
+            )
         )
-    )
 
     if moving_averages:
-        _add_moving_averages(fig, ohlcv, moving_averages)
+        _add_moving_averages(fig, source, moving_averages, x_ms, positions)
 
     fig.update_layout(
         title=dict(text=title, font=dict(color="#e2e8f0")) if title else None,
@@ -239,6 +482,7 @@ def plot_candles(
 
     fig.layout.meta = fig.layout.meta or {}
     fig.layout.meta["baseCandleWidthMs"] = candle_width
+    fig.layout.meta["aggregation"] = aggregation
 
     # Comments for streamlit/callback usage are embedded here for quick reference.
     fig.add_annotation(
@@ -255,7 +499,13 @@ def plot_candles(
         font=dict(size=10, color="#64748b"),
     )
 
+    if cache_key is not None:
+        _FIGURE_CACHE[cache_key] = (fig, values)
+        _FIGURE_CACHE.move_to_end(cache_key)
+        while len(_FIGURE_CACHE) > _FIGURE_CACHE_SIZE:
+            _FIGURE_CACHE.popitem(last=False)
+
     return fig
 
 
-__all__ = ["plot_candles", "MovingAverageSpec"]
+__all__ = ["plot_candles", "MovingAverageSpec", "IncrementalResampler"]
@@ -249,10 +249,8 @@ const Index = () => {
         }));
       };
       
-      ws.onmessage = (event) => {
+      const handleMessage = (message) => {
         try {
-          const message = JSON.parse(event.data);
-          
           // Handle trade/tick messages from backend
           if (message.type === 'trade' || message.type === 'tick') {
             // Backend sends tick data directly (not in message.data)
@@ -480,6 +478,21 @@ const Index = () => {
         }
       };
       
+      ws.onmessage = (event) => {
+        try {
+          const message = JSON.parse(event.data);
+          
+          // Trades are coalesced into one frame by the backend; replay them individually
+          if (message.type === 'trades') {
+            message.items.forEach((item) => handleMessage({ type: 'trade', ...item }));
+          } else {
+            handleMessage(message);
+          }
+        } catch (error) {
+          console.error('WebSocket message error:', error);
+        }
+      };
+      
       ws.onerror = (error) => {
         console.error('WebSocket error:', error);
         toast.error('WebSocket connection error');